@@ -11,32 +11,83 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import defer
 from sqlalchemy.orm.attributes import flag_modified
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from urllib.parse import urlparse, urlunparse
 import secrets
-import base64
 import os
 import hashlib
 import json
+import re
+import threading
+import time
+
+# Markdown rendering for clean-page clips (falls back to basic formatting)
+try:
+    import markdown
+    MARKDOWN_AVAILABLE = True
+except ImportError:
+    MARKDOWN_AVAILABLE = False
 
 from .models import File, Folder, User
-from extensions import db
-from .utils import save_data_uri_images_for_user, get_image_hash, get_existing_image_by_hash, convert_to_webp
+from extensions import db, ORJSON_AVAILABLE
+# Optional fast JSON parser; extensions decides whether orjson is in use
+if ORJSON_AVAILABLE:
+    from extensions import orjson
+from .utils import save_data_uris_batch, get_image_hash, get_existing_image_by_hash, convert_to_webp
 from utilities_main import update_user_data_size, check_guest_limit
 from values_main import UPLOAD_FOLDER, MAX_IMAGE_SIZE
 
 extension_api_bp = Blueprint('extension_api', __name__, url_prefix='/api/extension')
 
+# Clean-page clips can carry many inline images; WebP conversion for new ones
+# runs on a small per-request worker pool (capped process-wide in utils).
+EXTENSION_IMAGE_WORKERS = 4
+
+# Short-lived token -> user_id cache. The extension authenticates every call,
+# so repeat requests within the TTL resolve the user by primary key (usually an
+# identity-map hit) instead of re-running the token/expiry filter query.
+API_TOKEN_CACHE_TTL = 60  # seconds
+API_TOKEN_CACHE_MAX = 10_000
+_api_token_cache = {}  # token -> (user_id, cached_until)
+_api_token_cache_lock = threading.Lock()
+
+# Clean-page markdown patterns
+MD_DATA_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\((data:image[^)]+)\)')  # ![alt](data:image/...)
+MD_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+# One line of the no-markdown-library fallback (run on HTML-escaped text):
+# heading (#, ##, ###), blockquote ("> ", escaped to "&gt; "), blank, or paragraph
+MD_FALLBACK_LINE_RE = re.compile(
+    r'^(?:(#{1,3}) (.*)|&gt; (.*)|([^\S\n]*)|(.*))$',
+    re.MULTILINE
+)
+
+# Single-pass HTML escaping tables for clipped text
+HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+HTML_ESCAPE_BR_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '\n': '<br>'})
+
 
 # ========================
 # Helper Functions
 # ========================
 
+# Characters whose presence means urlparse/urlunparse could change the URL
+_URL_STRIPPED_PARTS = frozenset('?#;\t\r\n')
+
+
+@lru_cache(maxsize=8192)
 def normalize_url(url: str) -> str:
     """
     Normalize URL for grouping by stripping query params and fragments.
     
+    Results are memoized: the extension sends the same page URL for every
+    clip taken from a tab, so repeat lookups skip parsing entirely. URLs that
+    are already normalized (no query/fragment/params, no trailing slash,
+    lowercase scheme) are returned as-is without parsing.
+    
     Examples:
         https://example.com?utm_source=twitter  →  https://example.com
         https://example.com/page#section        →  https://example.com/page
@@ -45,8 +96,12 @@ def normalize_url(url: str) -> str:
     if not url:
         return ''
     
+    scheme_end = url.find('://')
+    if (scheme_end > 0 and url[:scheme_end].islower() and not url.endswith('/')
+            and url == url.strip() and _URL_STRIPPED_PARTS.isdisjoint(url)):
+        return url
+    
     try:
-        from urllib.parse import urlparse, urlunparse
         parsed = urlparse(url.strip())
         # Keep scheme, netloc, path only (drop query, fragment)
         normalized = urlunparse((
@@ -61,42 +116,133 @@ def normalize_url(url: str) -> str:
         return url.strip()
 
 
+def clear_api_token_cache(token=None):
+    """Drop one cached token (or all of them) so the next request re-verifies."""
+    with _api_token_cache_lock:
+        if token is None:
+            _api_token_cache.clear()
+        else:
+            _api_token_cache.pop(token, None)
+
+
 def verify_api_token(token):
     """Verify API token and return associated user."""
     if not token:
         return None
     
+    now = time.monotonic()
+    with _api_token_cache_lock:
+        cached = _api_token_cache.get(token)
+    
+    if cached and cached[1] > now:
+        # Re-check token and expiry on the loaded row so regenerated/revoked
+        # tokens stop working immediately, even in other worker processes
+        user = db.session.get(User, cached[0])
+        if (user and user.api_token == token
+                and user.api_token_expires and user.api_token_expires > datetime.utcnow()):
+            return user
+        clear_api_token_cache(token)
+        return None
+    
     # Find user with matching token that hasn't expired
     user = User.query.filter(
         User.api_token == token,
         User.api_token_expires > datetime.utcnow()
     ).first()
     
+    if user:
+        with _api_token_cache_lock:
+            if len(_api_token_cache) >= API_TOKEN_CACHE_MAX:
+                _api_token_cache.clear()
+            _api_token_cache[token] = (user.id, now + API_TOKEN_CACHE_TTL)
+    
     return user
 
 
-def build_folder_tree(folder, include_children=True):
-    """Recursively build folder tree structure for extension UI."""
-    folder_data = {
-        'id': folder.id,
-        'name': folder.name,
-        'parent_id': folder.parent_id,
-        'is_root': folder.is_root,
-        'children': []
-    }
+def get_bearer_token():
+    """Return the token from an "Authorization: Bearer <token>" header, or None."""
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return None
+    return auth_header[7:]
+
+
+def require_bearer_token(view):
+    """
+    Authenticate extension requests by API token.
     
-    if include_children:
-        child_folders = Folder.query.filter_by(
-            user_id=folder.user_id,
-            parent_id=folder.id
-        ).order_by(Folder.name).all()
+    Passes the token's user as the first argument to the view, or returns
+    401 when the header is missing or the token is invalid/expired.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = get_bearer_token()
+        if token is None:
+            return jsonify({'error': 'Missing Authorization header'}), 401
+        
+        user = verify_api_token(token)
+        if not user:
+            return jsonify({'error': 'Invalid or expired token'}), 401
         
-        folder_data['children'] = [
-            build_folder_tree(child, include_children=True)
-            for child in child_folders
-        ]
+        return view(user, *args, **kwargs)
+    return wrapper
+
+
+def build_folder_tree(user_id, root_folder_id):
+    """
+    Build the folder tree structure for extension UI.
     
-    return folder_data
+    Loads all of the user's folders in one query and links children to parents
+    in Python, instead of issuing one query per folder while recursing.
+    Children are ordered by name.
+    """
+    rows = db.session.query(
+        Folder.id, Folder.name, Folder.parent_id, Folder.is_root
+    ).filter_by(user_id=user_id).order_by(Folder.name).all()
+    
+    nodes = {
+        row.id: {
+            'id': row.id,
+            'name': row.name,
+            'parent_id': row.parent_id,
+            'is_root': row.is_root,
+            'children': []
+        }
+        for row in rows
+    }
+    
+    # Rows are name-ordered, so appending keeps each children list sorted
+    for row in rows:
+        parent = nodes.get(row.parent_id)
+        if parent is not None:
+            parent['children'].append(nodes[row.id])
+    
+    return nodes.get(root_folder_id)
+
+
+def get_or_create_root_folder_id(user_id):
+    """
+    Return (root_folder_id, created) for a user, creating the root folder if missing.
+    
+    Creation is a single INSERT ... ON DUPLICATE KEY UPDATE against the unique
+    root_key column, so concurrent first requests can't create two roots; on a
+    duplicate, LAST_INSERT_ID(id) hands back the existing row's id. The caller
+    owns the transaction and commits when created is True.
+    """
+    root_id = db.session.query(Folder.id).filter_by(
+        user_id=user_id,
+        is_root=True
+    ).scalar()
+    if root_id is not None:
+        return root_id, False
+    
+    stmt = mysql_insert(Folder).values(
+        name='root',
+        user_id=user_id,
+        parent_id=None,
+        is_root=True
+    ).on_duplicate_key_update(id=db.func.last_insert_id(Folder.id))
+    return db.session.execute(stmt).lastrowid, True
 
 
 def get_or_create_web_clippings_folder(user):
@@ -111,28 +257,14 @@ def get_or_create_web_clippings_folder(user):
     Returns:
         Folder object for "Web Clippings"
     """
-    # Get user's root folder
-    root_folder = Folder.query.filter_by(
-        user_id=user.id,
-        is_root=True
-    ).first()
-    
-    if not root_folder:
-        # Create root folder if missing
-        root_folder = Folder(
-            name='root',
-            user_id=user.id,
-            parent_id=None,
-            is_root=True
-        )
-        db.session.add(root_folder)
-        db.session.flush()
+    # Get (or create) user's root folder
+    root_folder_id, _ = get_or_create_root_folder_id(user.id)
     
     # Look for existing "Web Clippings" folder
     web_clippings = Folder.query.filter_by(
         user_id=user.id,
         name='Web Clippings',
-        parent_id=root_folder.id
+        parent_id=root_folder_id
     ).first()
     
     if not web_clippings:
@@ -141,7 +273,7 @@ def get_or_create_web_clippings_folder(user):
             name='Web Clippings',
             description='Content saved from Chrome extension',
             user_id=user.id,
-            parent_id=root_folder.id,
+            parent_id=root_folder_id,
             is_root=False
         )
         db.session.add(web_clippings)
@@ -151,12 +283,23 @@ def get_or_create_web_clippings_folder(user):
 
 
 def calculate_data_uri_bytes(data_uri: str) -> int:
-    """Return decoded byte length for a data URI image string."""
-    try:
-        _, b64data = data_uri.split(',', 1)
-        return len(base64.b64decode(b64data))
-    except Exception:
+    """
+    Return decoded byte length for a data URI image string.
+    
+    Computed from the base64 length and padding, without decoding or
+    copying the payload.
+    """
+    comma = data_uri.find(',')
+    if comma < 0:
         return 0
+    b64_length = len(data_uri) - comma - 1
+    if data_uri.endswith('=='):
+        padding = 2
+    elif data_uri.endswith('='):
+        padding = 1
+    else:
+        padding = 0
+    return max((b64_length * 3) // 4 - padding, 0)
 
 
 def build_extension_description(source_url: str, page_title: str, page_description: str) -> dict:
@@ -171,6 +314,12 @@ def build_extension_description(source_url: str, page_title: str, page_descripti
     return {k: v for k, v in fields.items() if v}
 
 
+def _description_sort_key(item):
+    """Order description entries numerically by key ("1".."N"), non-numeric keys last."""
+    key = str(item[0])
+    return (0, int(key)) if key.isdecimal() else (1, key)
+
+
 def normalize_description_entries(raw_value):
     """Normalize saved descriptions (string/dict/list) into an ordered list of strings."""
     if not raw_value:
@@ -182,19 +331,18 @@ def normalize_description_entries(raw_value):
         if not stripped:
             return []
         try:
-            parsed = json.loads(stripped)
+            parsed = orjson.loads(stripped) if ORJSON_AVAILABLE else json.loads(stripped)
         except Exception:
             return [stripped]
 
-    if isinstance(parsed, dict):
-        def _sort_key(key):
-            try:
-                return (0, int(key))
-            except Exception:
-                return (1, str(key))
+    if isinstance(parsed, list):
+        # Common case: already a list, strip each entry once and drop blanks
+        texts = (str(v).strip() for v in parsed)
+        return [text for text in texts if text]
 
+    if isinstance(parsed, dict):
         ordered = []
-        for _, value in sorted(parsed.items(), key=lambda item: _sort_key(item[0])):
+        for _, value in sorted(parsed.items(), key=_description_sort_key):
             if value is None:
                 continue
             text = str(value).strip()
@@ -202,9 +350,6 @@ def normalize_description_entries(raw_value):
                 ordered.append(text)
         return ordered
 
-    if isinstance(parsed, list):
-        return [str(v).strip() for v in parsed if str(v).strip()]
-
     return [str(parsed).strip()]
 
 
@@ -238,13 +383,28 @@ def find_or_create_extension_file(user, folder, normalized_url, page_title):
     existing_file = None
     
     if normalized_url:
-        # Try to find existing file by normalized source URL
-        existing_file = File.query.filter_by(
+        # Serialize concurrent saves into this folder (row lock held until the
+        # caller commits/rolls back) so two clips from the same page can't both
+        # miss the lookup below and create duplicate files.
+        db.session.query(Folder.id).filter(Folder.id == folder.id).with_for_update().scalar()
+        
+        # Try to find existing file by normalized source URL. Content columns are
+        # deferred: accumulated clip files can be many MB and are only read when
+        # the caller actually appends. This must be a locking read too: under
+        # InnoDB's REPEATABLE READ a plain SELECT reads the transaction's snapshot
+        # and would miss a file another save committed while we waited for the
+        # folder lock; FOR UPDATE reads the latest committed rows.
+        existing_file = File.query.options(
+            defer(File.content_html),
+            defer(File.content_text),
+            defer(File.content_json),
+            defer(File.content_blob)
+        ).filter_by(
             owner_id=user.id,
             folder_id=folder.id,
             source_url=normalized_url,
             type='proprietary_note'
-        ).first()
+        ).with_for_update().first()
     
     if existing_file:
         return existing_file, False
@@ -269,6 +429,27 @@ def find_or_create_extension_file(user, folder, normalized_url, page_title):
     return new_file, True
 
 
+CLIP_SEPARATOR = (
+    '<hr style="border: none; border-top: 2px dashed #888; '
+    'margin: 30px 0; opacity: 0.5;" />'
+)
+# Bytes added around each appended clip ("\n<separator>\n")
+CLIP_SEPARATOR_BYTES = len(f"\n{CLIP_SEPARATOR}\n".encode('utf-8'))
+
+
+def _markdown_fallback_line(match):
+    """Render one MD_FALLBACK_LINE_RE match as HTML."""
+    hashes, heading, quote, blank, text = match.groups()
+    if hashes:
+        level = len(hashes)
+        return f'<h{level}>{heading}</h{level}>'
+    if quote is not None:
+        return f'<blockquote>{quote}</blockquote>'
+    if blank is not None:
+        return '<br>'
+    return f'<p>{text}</p>'
+
+
 def append_to_html_content(existing_html: str, new_content: str) -> str:
     """
     Append new content to existing HTML with visual separator.
@@ -278,15 +459,35 @@ def append_to_html_content(existing_html: str, new_content: str) -> str:
         <hr style="...">
         new content
     """
-    separator = (
-        '<hr style="border: none; border-top: 2px dashed #888; '
-        'margin: 30px 0; opacity: 0.5;" />'
-    )
-    
-    if not existing_html or existing_html.strip() == '':
+    if not existing_html:
         return new_content
     
-    return f"{existing_html}\n{separator}\n{new_content}"
+    return f"{existing_html}\n{CLIP_SEPARATOR}\n{new_content}"
+
+
+def append_to_html_content_sql(new_content: str):
+    """
+    SQL expression equivalent of append_to_html_content() for File.content_html.
+    
+    Lets the database concatenate in place (UPDATE ... SET content_html =
+    CONCAT(...)) so the existing HTML never travels to the app server.
+    """
+    return db.case(
+        (db.func.coalesce(File.content_html, '') == '', new_content),
+        else_=db.func.concat(File.content_html, f"\n{CLIP_SEPARATOR}\n{new_content}")
+    )
+
+
+def appended_content_bytes(existing_size: int, new_content: str) -> int:
+    """
+    Return the UTF-8 size change of appending new_content to HTML of existing_size bytes.
+    
+    Only the new clip is encoded; the existing HTML is never needed.
+    """
+    new_bytes = len(new_content.encode('utf-8'))
+    if not existing_size:
+        return new_bytes
+    return CLIP_SEPARATOR_BYTES + new_bytes
 
 
 # ========================
@@ -311,6 +512,10 @@ def generate_token():
         # Set expiration to 1 year from now
         expiration = datetime.utcnow() + timedelta(days=365)
         
+        # Forget the previous token before replacing it
+        if current_user.api_token:
+            clear_api_token_cache(current_user.api_token)
+        
         # Store hashed version in database
         current_user.api_token = token
         current_user.api_token_expires = expiration
@@ -341,11 +546,10 @@ def verify_token():
     Headers: Authorization: Bearer <token>
     Returns: {"valid": true, "user": {...}}
     """
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
+    token = get_bearer_token()
+    if token is None:
         return jsonify({'valid': False, 'error': 'Missing or invalid Authorization header'}), 401
     
-    token = auth_header.replace('Bearer ', '')
     user = verify_api_token(token)
     
     if not user:
@@ -371,6 +575,9 @@ def revoke_token():
     POST /api/extension/revoke-token
     """
     try:
+        if current_user.api_token:
+            clear_api_token_cache(current_user.api_token)
+        
         current_user.api_token = None
         current_user.api_token_expires = None
         db.session.commit()
@@ -387,61 +594,56 @@ def revoke_token():
 # ========================
 
 @extension_api_bp.route('/folders', methods=['GET'])
-def get_folders():
+@require_bearer_token
+def get_folders(user):
     """
     Get user's folder tree for dropdown selection.
     
     GET /api/extension/folders
     Headers: Authorization: Bearer <token>
     Returns: {"folders": [...], "default_folder_id": 123}
-    """
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return jsonify({'error': 'Missing Authorization header'}), 401
-    
-    token = auth_header.replace('Bearer ', '')
-    user = verify_api_token(token)
-    
-    if not user:
-        return jsonify({'error': 'Invalid or expired token'}), 401
     
+    Responses carry a weak ETag derived from the folder tree itself; a
+    matching If-None-Match gets an empty 304 instead of the tree payload.
+    """
     try:
-        # Get root folder
-        root_folder = Folder.query.filter_by(
-            user_id=user.id,
-            is_root=True
-        ).first()
-        
-        if not root_folder:
-            # Create root folder if missing
-            root_folder = Folder(
-                name='root',
-                user_id=user.id,
-                parent_id=None,
-                is_root=True
-            )
-            db.session.add(root_folder)
+        # Get root folder (created on first use)
+        root_folder_id, created = get_or_create_root_folder_id(user.id)
+        if created:
             db.session.commit()
         
-        # Build complete folder tree
-        folder_tree = build_folder_tree(root_folder)
+        # Build complete folder tree (one query over the user's folders)
+        folder_tree = build_folder_tree(user.id, root_folder_id)
         
         # Get user's preferred default folder (or use root)
-        default_folder_id = user.user_prefs.get('extension_default_folder', root_folder.id) if user.user_prefs else root_folder.id
+        default_folder_id = user.user_prefs.get('extension_default_folder', root_folder_id) if user.user_prefs else root_folder_id
         
-        return jsonify({
+        payload = {
             'success': True,
             'folders': [folder_tree],  # Return as array for consistency
             'default_folder_id': default_folder_id,
-            'root_folder_id': root_folder.id
-        })
+            'root_folder_id': root_folder_id
+        }
+        etag = hashlib.sha1(
+            json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        ).hexdigest()
+        
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify(payload)
+        
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except SQLAlchemyError as e:
         return jsonify({'success': False, 'error': 'Database error'}), 500
 
 
 @extension_api_bp.route('/set-default-folder', methods=['POST'])
-def set_default_folder():
+@require_bearer_token
+def set_default_folder(user):
     """
     Set user's default folder for extension saves.
     
@@ -449,16 +651,6 @@ def set_default_folder():
     Headers: Authorization: Bearer <token>
     Body: {"folder_id": 123}
     """
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return jsonify({'error': 'Missing Authorization header'}), 401
-    
-    token = auth_header.replace('Bearer ', '')
-    user = verify_api_token(token)
-    
-    if not user:
-        return jsonify({'error': 'Invalid or expired token'}), 401
-    
     data = request.get_json()
     folder_id = data.get('folder_id')
     
@@ -495,7 +687,8 @@ def set_default_folder():
 # ========================
 
 @extension_api_bp.route('/save-content', methods=['POST'])
-def save_content():
+@require_bearer_token
+def save_content(user):
     """
     Save content from Chrome extension as MioNote file.
     
@@ -512,16 +705,6 @@ def save_content():
         "page_title": "Page Title"  # From tab
     }
     """
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return jsonify({'error': 'Missing Authorization header'}), 401
-    
-    token = auth_header.replace('Bearer ', '')
-    user = verify_api_token(token)
-    
-    if not user:
-        return jsonify({'error': 'Invalid or expired token'}), 401
-    
     data = request.get_json()
     content_type = data.get('type')
     content = data.get('content')
@@ -545,13 +728,16 @@ def save_content():
         new_html_content = ''
         bytes_added_from_images = 0
         
+        # Capture the save time once so the clip header, file and folder agree
+        now_ts = time.time()
+        now_utc = datetime.fromtimestamp(now_ts, timezone.utc).replace(tzinfo=None)  # naive UTC, like the DB columns
+        
         # Add timestamp header for this clip
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = datetime.fromtimestamp(now_ts).strftime('%Y-%m-%d %H:%M:%S')
         new_html_content += f'<p style="color: #999; font-size: 0.85em; margin-bottom: 10px;">📌 Saved: {timestamp}</p>'
 
         if content_type == 'text':
-            escaped_content = content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            formatted_content = escaped_content.replace('\n', '<br>')
+            formatted_content = content.translate(HTML_ESCAPE_BR_TABLE)
             new_html_content += f'<div>{formatted_content}</div>'
 
         elif content_type == 'image':
@@ -565,17 +751,10 @@ def save_content():
             if user.user_type == 'guest' and not check_guest_limit(user, estimated_size):
                 return jsonify({'success': False, 'error': 'Storage quota exceeded'}), 403
 
-            normalized_content = f'<img src="{content}" />'
-            updated_content, bytes_added_from_images = save_data_uri_images_for_user(normalized_content, user.id)
-
-            img_src = None
-            if updated_content:
-                try:
-                    soup = BeautifulSoup(updated_content, 'html.parser')
-                    img_tag = soup.find('img')
-                    img_src = img_tag.get('src') if img_tag else None
-                except Exception:
-                    img_src = None
+            # Saves (or reuses) the image and returns its URL directly - no
+            # wrapping it in an <img> tag and re-parsing the result
+            saved_images = save_data_uris_batch([content], user.id)
+            img_src, bytes_added_from_images = saved_images.get(content, (None, 0))
 
             if not img_src:
                 return jsonify({'success': False, 'error': 'Failed to save image'}), 500
@@ -591,72 +770,68 @@ def save_content():
         elif content_type == 'clean-page':
             # Convert markdown-formatted clean page content to HTML
             # First, extract and process images with data URIs
-            import re
-            
             # Find all markdown images: ![alt](data:image/...)
-            image_pattern = r'!\[([^\]]*)\]\((data:image[^)]+)\)'
-            images_found = re.findall(image_pattern, content)
+            images_found = MD_DATA_IMAGE_RE.findall(content)
             
-            # Process images through deduplication system
+            # Quota-check each distinct image first (DB access stays on this thread)
+            pending_images = {}
+            quota_removed = set()
             for alt_text, data_uri in images_found:
+                if data_uri in pending_images or data_uri in quota_removed:
+                    continue
                 # Calculate size for quota check
                 estimated_size = calculate_data_uri_bytes(data_uri)
                 
                 if estimated_size > 0:
                     if user.user_type == 'guest' and not check_guest_limit(user, estimated_size):
                         # Skip this image if quota exceeded
-                        content = content.replace(f'![{alt_text}]({data_uri})', f'[Image removed: quota exceeded]')
+                        quota_removed.add(data_uri)
                         continue
-                    
-                    # Convert data URI to saved image path
-                    temp_html = f'<img src="{data_uri}" alt="{alt_text}" />'
-                    processed_html, img_bytes = save_data_uri_images_for_user(temp_html, user.id)
-                    
-                    if processed_html and img_bytes > 0:
-                        bytes_added_from_images += img_bytes
-                        
-                        # Extract new image path from processed HTML
-                        img_match = re.search(r'src="([^"]+)"', processed_html)
-                        if img_match:
-                            new_img_path = img_match.group(1)
-                            # Replace data URI with saved image path in markdown
-                            content = content.replace(data_uri, new_img_path)
+                    pending_images[data_uri] = alt_text
+            
+            # Save all images in one batch through the deduplication system
+            # (existing images reuse their path and add 0 bytes)
+            saved_paths = {}  # data URI -> saved image path
+            if pending_images:
+                saved_images = save_data_uris_batch(
+                    pending_images, user.id, max_workers=EXTENSION_IMAGE_WORKERS
+                )
+                for data_uri, (image_url, img_bytes) in saved_images.items():
+                    bytes_added_from_images += img_bytes
+                    saved_paths[data_uri] = image_url
+            
+            # Rewrite all image references in one pass over the page
+            if saved_paths or quota_removed:
+                def _replace_image(match):
+                    alt_text, data_uri = match.group(1), match.group(2)
+                    if data_uri in quota_removed:
+                        return '[Image removed: quota exceeded]'
+                    new_img_path = saved_paths.get(data_uri)
+                    if new_img_path:
+                        return f'![{alt_text}]({new_img_path})'
+                    return match.group(0)
+                
+                content = MD_DATA_IMAGE_RE.sub(_replace_image, content)
             
             # Now convert markdown to HTML
-            try:
-                import markdown
+            if MARKDOWN_AVAILABLE:
                 # Convert markdown to HTML with extensions for better formatting
                 html_content = markdown.markdown(
                     content,
                     extensions=['fenced_code', 'tables', 'nl2br']
                 )
                 new_html_content += f'<div class="clean-page-content" style="max-width: 800px;">{html_content}</div>'
-            except ImportError:
+            else:
                 # Fallback: basic markdown-like formatting without markdown library
-                escaped_content = content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+                escaped_content = content.translate(HTML_ESCAPE_TABLE)
                 # Handle markdown images manually
-                escaped_content = re.sub(
-                    r'!\[([^\]]*)\]\(([^)]+)\)',
+                escaped_content = MD_IMAGE_RE.sub(
                     r'<img src="\2" alt="\1" style="max-width: 100%; height: auto;" />',
                     escaped_content
                 )
-                # Convert markdown headings to HTML
-                lines = escaped_content.split('\n')
-                formatted_lines = []
-                for line in lines:
-                    if line.startswith('# '):
-                        formatted_lines.append(f'<h1>{line[2:]}</h1>')
-                    elif line.startswith('## '):
-                        formatted_lines.append(f'<h2>{line[3:]}</h2>')
-                    elif line.startswith('### '):
-                        formatted_lines.append(f'<h3>{line[4:]}</h3>')
-                    elif line.startswith('> '):
-                        formatted_lines.append(f'<blockquote>{line[2:]}</blockquote>')
-                    elif line.strip() == '':
-                        formatted_lines.append('<br>')
-                    else:
-                        formatted_lines.append(f'<p>{line}</p>')
-                new_html_content += '<div class="clean-page-content" style="max-width: 800px;">' + '\n'.join(formatted_lines) + '</div>'
+                # Convert markdown headings/quotes/paragraphs to HTML, line by line in one pass
+                formatted_content = MD_FALLBACK_LINE_RE.sub(_markdown_fallback_line, escaped_content)
+                new_html_content += f'<div class="clean-page-content" style="max-width: 800px;">{formatted_content}</div>'
 
         else:
             return jsonify({'success': False, 'error': f'Unsupported content type: {content_type}'}), 400
@@ -664,24 +839,30 @@ def save_content():
         # Find or create file for this URL
         target_file, is_new_file = find_or_create_extension_file(user, folder, normalized_url, page_title)
         
-        # Calculate old size for delta tracking
-        old_content_size = 0
-        if not is_new_file and target_file.content_html:
-            old_content_size = len(target_file.content_html.encode('utf-8'))
-        
-        # Append or set content
+        # Append or set content, tracking the size delta from the new clip alone
         if is_new_file:
+            content_size_delta = len(new_html_content.encode('utf-8'))
             target_file.content_html = new_html_content
+            # CRITICAL: Flag modified for LONGTEXT column (content_html)
+            flag_modified(target_file, 'content_html')
         else:
-            target_file.content_html = append_to_html_content(target_file.content_html, new_html_content)
-            target_file.last_modified = datetime.utcnow()
+            # Append server-side; the (deferred) existing HTML is never loaded
+            existing_size = db.session.query(
+                db.func.length(File.content_html)  # MySQL LENGTH() is in bytes
+            ).filter(File.id == target_file.id).scalar()
+            content_size_delta = appended_content_bytes(existing_size, new_html_content)
+            File.query.filter(File.id == target_file.id).update(
+                {File.content_html: append_to_html_content_sql(new_html_content)},
+                synchronize_session=False
+            )
+            target_file.last_modified = now_utc
             
             # Update clip count
             if not target_file.metadata_json:
                 target_file.metadata_json = {}
             clip_count = target_file.metadata_json.get('clip_count', 0) + 1
             target_file.metadata_json['clip_count'] = clip_count
-            target_file.metadata_json['last_clip_at'] = datetime.utcnow().isoformat()
+            target_file.metadata_json['last_clip_at'] = now_utc.isoformat()
 
         if not target_file.metadata_json:
             target_file.metadata_json = {}
@@ -690,33 +871,27 @@ def save_content():
         extension_entries = build_extension_description_entries(normalized_url)
         target_file.metadata_json['description'] = merge_description_entries(existing_entries, extension_entries)
         
-        # CRITICAL: Flag modified for LONGTEXT column (content_html)
-        flag_modified(target_file, 'content_html')
         flag_modified(target_file, 'metadata_json')
         
-        # Calculate new size for delta
-        new_content_size = len(target_file.content_html.encode('utf-8'))
-        content_size_delta = new_content_size - old_content_size
-        
         # Add to session
         if is_new_file:
             db.session.add(target_file)
         
-        folder.last_modified = datetime.utcnow()
+        folder.last_modified = now_utc
         
-        # Commit database changes
-        db.session.commit()
-        
-        # Update quota with delta (content + images)
+        # Final quota check for non-image content, before anything is committed
+        # so a rejected clip is rolled back rather than left saved
         total_delta = content_size_delta + bytes_added_from_images
+        if total_delta > 0 and user.user_type == 'guest' and content_type != 'image':
+            if not check_guest_limit(user, total_delta):
+                db.session.rollback()
+                return jsonify({'success': False, 'error': 'Storage quota exceeded'}), 403
+        
+        # Commit file, folder and quota (content + images) changes in one transaction
         if total_delta > 0:
-            # Final quota check for non-image content
-            if user.user_type == 'guest' and content_type != 'image':
-                if not check_guest_limit(user, total_delta):
-                    db.session.rollback()
-                    return jsonify({'success': False, 'error': 'Storage quota exceeded'}), 403
-            
             update_user_data_size(user, total_delta)
+        else:
+            db.session.commit()
 
         action_verb = 'created' if is_new_file else 'updated'
         clip_info = f" (clip #{target_file.metadata_json.get('clip_count', 1)})" if not is_new_file else ''
@@ -254,15 +254,17 @@ def edit_note(note_id):
     breadcrumb = build_folder_breadcrumb(note.folder) if note.folder else []
     return render_template('p2/file_edit_proprietary_note.html', file=note, folder_breadcrumb=breadcrumb)
 
+# External <img src="http(s)://..."> tags. The tag body excludes '<' so an unterminated
+# "<img" in user HTML stops at the next tag instead of rescanning the rest of the document.
+EXTERNAL_IMG_RE = re.compile(r'<img\b[^<>]*?src="(https?://[^"<>]+)"[^<>]*>')
+
+
 def extract_and_save_images(content, user_id):
     """
     Extract external images from HTML content and convert to WebP with deduplication, replace with file paths
     """
     
 
-    # Pattern to match external image URLs (http/https)
-    external_pattern = r'<img[^>]*src="(https?://[^"]+)"[^>]*>'
-
     def replace_external_image(match):
         full_match = match.group(0)
         image_url = match.group(1)
@@ -331,11 +333,10 @@ def extract_and_save_images(content, user_id):
             return full_match  # Keep original on error
 
     # Replace all external images
-    updated_content = re.sub(external_pattern, replace_external_image, content)
+    updated_content = EXTERNAL_IMG_RE.sub(replace_external_image, content)
 
     # Now also handle inline data:image/...;base64,... images and save them to UPLOAD_FOLDER
-    from bs4 import BeautifulSoup
-    import base64, mimetypes, uuid, shutil
+    import mimetypes
     soup = BeautifulSoup(updated_content, 'html.parser')
     for img in soup.find_all('img'):
         src = img.get('src', '')
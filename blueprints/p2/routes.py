@@ -9,7 +9,9 @@ from blueprints.p2.models import  User, Folder, File, VALID_FILE_TYPES, CREATABL
 from extensions import db, login_manager
 from sqlalchemy.exc import OperationalError
 import time
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 import bleach
 from bs4 import BeautifulSoup
 import traceback
@@ -72,51 +74,64 @@ def extension_settings():
     return response
 
 
+# Files shipped in the Chrome extension ZIP, relative to chrome_extension/
+EXTENSION_ZIP_FILES = ['manifest.json', 'popup.html', 'popup.css', 'popup.js', 'background.js']
+EXTENSION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'chrome_extension')
+
+
+def _extension_zip_entries(extension_dir):
+    """Return (source_path, archive_name) pairs for every file in the extension ZIP."""
+    entries = []
+    for name in EXTENSION_ZIP_FILES:
+        file_path = os.path.join(extension_dir, name)
+        if os.path.exists(file_path):
+            entries.append((file_path, name))
+
+    icons_dir = os.path.join(extension_dir, 'icons')
+    if os.path.isdir(icons_dir):
+        # scandir's DirEntry already knows the file type, so no per-icon stat/join
+        with os.scandir(icons_dir) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    entries.append((entry.path, f'icons/{entry.name}'))
+    return entries
+
+
+@lru_cache(maxsize=1)
+def _build_extension_zip(entries, signature):
+    """Build the extension ZIP once per file signature and return (zip_bytes, etag).
+
+    ``signature`` (mtimes and sizes of every entry) is only part of the cache key,
+    so editing any extension file rebuilds the archive on the next download.
+    """
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
+        for file_path, arcname in entries:
+            zipf.write(file_path, arcname)
+    zip_bytes = zip_buffer.getvalue()
+    return zip_bytes, hashlib.sha1(zip_bytes).hexdigest()
+
+
 @p2_blueprint.route('/download-chrome-extension')
 @login_required
 def download_chrome_extension():
-    """Generate and download Chrome extension as ZIP file."""
+    """Download the Chrome extension as a ZIP file (built once, rebuilt when files change)."""
     try:
-        # Create in-memory ZIP file
-        zip_buffer = io.BytesIO()
-        
-        # Path to chrome_extension folder
-        extension_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'chrome_extension')
-        
-        # Create ZIP with all extension files
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add manifest.json
-            manifest_path = os.path.join(extension_dir, 'manifest.json')
-            if os.path.exists(manifest_path):
-                zipf.write(manifest_path, 'manifest.json')
-            
-            # Add popup files
-            for popup_file in ['popup.html', 'popup.css', 'popup.js']:
-                file_path = os.path.join(extension_dir, popup_file)
-                if os.path.exists(file_path):
-                    zipf.write(file_path, popup_file)
-            
-            # Add background.js
-            background_path = os.path.join(extension_dir, 'background.js')
-            if os.path.exists(background_path):
-                zipf.write(background_path, 'background.js')
-            
-            # Add icons folder
-            icons_dir = os.path.join(extension_dir, 'icons')
-            if os.path.exists(icons_dir):
-                for icon_file in os.listdir(icons_dir):
-                    icon_path = os.path.join(icons_dir, icon_file)
-                    if os.path.isfile(icon_path):
-                        zipf.write(icon_path, os.path.join('icons', icon_file))
-        
-        # Prepare ZIP for download
-        zip_buffer.seek(0)
-        
+        entries = tuple(_extension_zip_entries(EXTENSION_DIR))
+        signature = tuple(
+            (st.st_mtime_ns, st.st_size) for st in (os.stat(path) for path, _ in entries)
+        )
+        zip_bytes, etag = _build_extension_zip(entries, signature)
+
+        # conditional=True answers matching If-None-Match requests with 304
         return send_file(
-            zip_buffer,
+            io.BytesIO(zip_bytes),
             mimetype='application/zip',
             as_attachment=True,
-            download_name='miohub-chrome-extension.zip'
+            download_name='miohub-chrome-extension.zip',
+            etag=etag,
+            max_age=3600,
+            conditional=True,
         )
         
     except Exception as e:
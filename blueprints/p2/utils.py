@@ -1,4 +1,6 @@
 import os
+import re
+import shutil
 import hashlib
 from PIL import Image
 import json
@@ -6,6 +8,8 @@ from flask import request, jsonify,  session
 import base64
 import uuid
 import mimetypes
+import threading
+from bs4 import BeautifulSoup
 
 from . import p2_blueprint
 from calculator import Calculator
@@ -138,8 +142,6 @@ def collect_images_from_content(content, image_set):
     
     Returns content unchanged
     """
-    import re
-    from bs4 import BeautifulSoup
     
     if not content:
         return content
@@ -271,8 +273,6 @@ def save_data_uri_images_for_user(content, user_id):
     Find <img src="data:image/...;base64,..."> in content, decode and save them to UPLOAD_FOLDER
     using the SHA256 hash as the filename. Returns (updated_content, bytes_added).
     """
-    from bs4 import BeautifulSoup
-    import shutil
     if not content:
         return content, 0
     soup = BeautifulSoup(content, 'html.parser')
@@ -362,13 +362,105 @@ def save_data_uri_images_for_user(content, user_id):
     return str(soup), total_added
 
 
+# Caps concurrent image conversions process-wide when batches run on worker threads
+IMAGE_CONVERSION_SLOTS = threading.BoundedSemaphore(8)
+
+
+def _store_decoded_image(raw_bytes, ext, user_id, image_hash):
+    """Write decoded image bytes as the user's {user_id}_{hash}.webp; returns (url, bytes_added) or None."""
+    tmp_path = os.path.join(UPLOAD_FOLDER, f"tmp_{uuid.uuid4().hex}{ext}")
+    dest_path = os.path.join(UPLOAD_FOLDER, f"{user_id}_{image_hash}.webp")
+    with IMAGE_CONVERSION_SLOTS:
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(raw_bytes)
+            try:
+                converted = convert_to_webp(tmp_path, dest_path)
+            except Exception:
+                # fallback copy
+                shutil.copy2(tmp_path, dest_path)
+                converted = dest_path
+            if not os.path.exists(converted):
+                return None
+            return f"/static/uploads/images/{os.path.basename(converted)}", os.path.getsize(converted)
+        except Exception:
+            return None
+        finally:
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except Exception:
+                pass
+
+
+def save_data_uris_batch(data_uris, user_id, max_workers=1):
+    """
+    Save many data-URI images for a user in one batch.
+
+    Payloads are decoded and hashed in memory, identical images are stored once,
+    and images the user already has (same SHA256) are reused without conversion.
+    Only new images are written/converted, on up to max_workers threads.
+    Returns {data_uri: (image_url, bytes_added)} for every image that was saved or reused.
+    """
+    uri_hashes = {}  # data URI -> sha256
+    new_images = {}  # sha256 -> (raw bytes, extension)
+    for data_uri in data_uris:
+        if data_uri in uri_hashes:
+            continue
+        try:
+            header, b64data = data_uri.split(',', 1)
+            mime = header.split(';')[0].split(':')[1] if ';' in header else header.split(':')[1]
+            raw_bytes = base64.b64decode(b64data)
+        except Exception:
+            continue
+        image_hash = hashlib.sha256(raw_bytes).hexdigest()
+        uri_hashes[data_uri] = image_hash
+        new_images.setdefault(image_hash, (raw_bytes, mimetypes.guess_extension(mime) or '.png'))
+
+    stored = {}  # sha256 -> (image_url, bytes_added)
+    for image_hash in list(new_images):
+        existing_url = get_existing_image_by_hash(user_id, image_hash)
+        if existing_url:
+            stored[image_hash] = (existing_url, 0)
+            del new_images[image_hash]
+
+    if new_images:
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+        def _store(item):
+            image_hash, (raw_bytes, ext) = item
+            return image_hash, _store_decoded_image(raw_bytes, ext, user_id, image_hash)
+
+        if max_workers > 1 and len(new_images) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(new_images))) as executor:
+                results = list(executor.map(_store, new_images.items()))
+        else:
+            results = [_store(item) for item in new_images.items()]
+
+        for image_hash, result in results:
+            if result:
+                stored[image_hash] = result
+                print(f"DEBUG: save_data_uris_batch - saved image for user {user_id} at {result[0]} ({result[1]} bytes)")
+
+    # Each stored image is billed once even if several URIs map to it
+    saved = {}
+    billed = set()
+    for data_uri, image_hash in uri_hashes.items():
+        if image_hash not in stored:
+            continue
+        image_url, bytes_added = stored[image_hash]
+        saved[data_uri] = (image_url, 0 if image_hash in billed else bytes_added)
+        billed.add(image_hash)
+    return saved
+
+
 def copy_images_to_user(image_filenames, receiver_user_id):
     """
     Copy an iterable of image filenames found in content to the receiver's upload directory.
     Returns tuple: (mapping_old_to_new_filename, total_bytes_added)
     The function respects existing images for the receiver (checks by hash via get_existing_image_by_hash).
     """
-    import os, shutil
     mapping = {}
     total_added = 0
     for filename in set(image_filenames or []):
@@ -612,7 +704,6 @@ def convert_to_webp(input_path, output_path, max_width=1200, quality=85):
             # If all fails, copy original with correct extension
             if input_path != output_path:
                 try:
-                    import shutil
                     # Get original extension
                     _, ext = os.path.splitext(input_path)
                     correct_path = output_path.replace('.webp', ext.lower())
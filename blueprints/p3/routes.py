@@ -1,12 +1,13 @@
-from flask import render_template, request, jsonify, session, redirect, url_for, flash
+from flask import render_template, request, jsonify, session, redirect, url_for, flash, Response, stream_with_context
 from flask_login import login_required, current_user
 from . import p3_blueprint
 from .models import ChatSession, ChatMessage, ChatMemory
 from extensions import db
 from datetime import datetime
 import os
+import json
 import requests
-from providers import LLMClient
+from providers import LLMClient, http_session
 from sqlalchemy.orm.attributes import flag_modified
 from blueprints.p3.chat_attachment_service import (
     create_attachment_from_upload,
@@ -27,6 +28,9 @@ logging.getLogger('sqlalchemy.engine').setLevel(
 llm_client = LLMClient()
 logger = logging.getLogger(__name__)
 
+# O(1) membership test for /set_model; the list itself is still passed to templates for ordering
+AVAILABLE_CHAT_MODEL_SET = frozenset(config.AVAILABLE_CHAT_MODELS)
+
 
 def _build_llm_messages(user_message: str, memory_items: list[str]) -> list[dict]:
     """Create the LLM messages payload using memory first, then the user prompt."""
@@ -62,6 +66,29 @@ def _generate_ai_reply(user_message: str, memory_items: list[str], model: str) -
 
     return ai_response
 
+
+def _stream_ai_reply(user_message: str, memory_items: list[str], model: str):
+    """Stream the assistant reply chunk by chunk, yielding an error message on failure."""
+    llm_messages = _build_llm_messages(user_message, memory_items)
+    try:
+        llm_client.model = model
+        yield from llm_client.stream_chat(
+            messages=llm_messages,
+            temperature=0.7,
+            max_tokens=2048
+        )
+    except requests.exceptions.RequestException as exc:
+        logger.error("LLM API error: %s", exc)
+        yield "Connection error. Please check your API configuration."
+    except Exception as exc:  # noqa: BLE001
+        logger.error("LLM error: %s", exc)
+        yield f"Error: {str(exc)}"
+
+
+def _sse_event(payload: dict) -> str:
+    """Format a payload as a single server-sent event frame."""
+    return f"data: {json.dumps(payload)}\n\n"
+
 @p3_blueprint.route('/chatbot')
 @login_required
 def chatbot():
@@ -189,22 +216,50 @@ def chat():
     print(f"Using model: {current_model}")
     print(f"Using provider: {config.PROVIDER}")
 
-    ai_response = _generate_ai_reply(user_message, combined_memory, current_model)
+    def save_ai_response(ai_response):
+        ai_message = ChatMessage(
+            session_id=current_session_id,
+            model=current_model,
+            role='assistant',
+            content=ai_response
+        )
+        db.session.add(ai_message)
 
-    # Save AI response
-    ai_message = ChatMessage(
-        session_id=current_session_id,
-        model=current_model,
-        role='assistant',
-        content=ai_response
-    )
-    db.session.add(ai_message)
+        # Update session timestamp
+        if chat_session:
+            chat_session.updated_at = datetime.utcnow()
 
-    # Update session timestamp
-    if chat_session:
-        chat_session.updated_at = datetime.utcnow()
+        db.session.commit()
+        return ai_message
+
+    if data.get('stream'):
+        # Stream tokens as server-sent events; the assembled reply is saved once
+        # the provider finishes (or the client disconnects mid-stream).
+        def generate():
+            chunks = []
+            try:
+                for chunk in _stream_ai_reply(user_message, combined_memory, current_model):
+                    chunks.append(chunk)
+                    yield _sse_event({'delta': chunk})
+            finally:
+                ai_message = save_ai_response(''.join(chunks))
+            yield _sse_event({
+                'done': True,
+                'model': current_model,
+                'user_message_id': user_message_obj.id,
+                'assistant_message_id': ai_message.id
+            })
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
 
-    db.session.commit()
+    ai_response = _generate_ai_reply(user_message, combined_memory, current_model)
+
+    # Save AI response
+    ai_message = save_ai_response(ai_response)
 
     return jsonify({
         'reply': ai_response,
@@ -520,8 +575,6 @@ def summarize_memory():
     
     try:
         # Use OpenRouter specifically for summarization (cost-effective)
-        import requests
-        
         url = "https://openrouter.ai/api/v1/chat/completions"
         headers = {
             "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
@@ -541,7 +594,8 @@ def summarize_memory():
             "max_tokens": config.SUMMARIZATION_MAX_TOKENS
         }
         
-        response = requests.post(url, json=payload, headers=headers, timeout=config.SUMMARIZATION_TIMEOUT)
+        # Pooled keep-alive session shared with the LLM client calls
+        response = http_session.post(url, json=payload, headers=headers, timeout=config.SUMMARIZATION_TIMEOUT)
         response.raise_for_status()
         result = response.json()
         summary = result["choices"][0]["message"]["content"].strip()
@@ -578,7 +632,7 @@ def set_model():
     data = request.get_json()
     model = data.get('model')
 
-    if model not in config.AVAILABLE_CHAT_MODELS:
+    if model not in AVAILABLE_CHAT_MODEL_SET:
         return jsonify({'status': 'error', 'message': 'Invalid model'}), 400
 
     session['current_model'] = model
@@ -592,10 +646,12 @@ def p3_admin_dashboard():
         flash('Access denied. Admin privileges required.')
         return redirect(url_for('p2_bp.dashboard'))
     
-    # Get admin dashboard data
-    total_sessions = ChatSession.query.count()
-    total_messages = ChatMessage.query.count()
-    total_memories = ChatMemory.query.count()
+    # Get admin dashboard data (all three totals in a single round trip)
+    total_sessions, total_messages, total_memories = db.session.query(
+        db.session.query(db.func.count(ChatSession.id)).scalar_subquery(),
+        db.session.query(db.func.count(ChatMessage.id)).scalar_subquery(),
+        db.session.query(db.func.count(ChatMemory.id)).scalar_subquery(),
+    ).one()
     
     # Get recent sessions
     recent_sessions = ChatSession.query.order_by(ChatSession.updated_at.desc()).limit(10).all()
@@ -1,7 +1,96 @@
 from dataclasses import dataclass
+from functools import lru_cache
+import ast
+import operator
 import re
 import math
 
+# Safe math context
+ALLOWED_NAMES = {
+    'sqrt': math.sqrt,
+    'cbrt': lambda x: x ** (1/3),
+    'log': math.log10,
+    'ln': math.log,
+    'pi': math.pi,
+    'e': math.e,
+    # 👇 CUSTOM FUNCTIONS
+    'profit': lambda cp, sp: (sp - cp) / cp if cp != 0 else 'Error',
+    'tax': lambda amount, rate: (amount * rate / 100),
+    'markup': lambda cp, percent: cp + (cp * percent / 100),
+}
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# Operand types the arithmetic operators accept
+NUMBER_TYPES = (int, float, complex)
+
+# Largest exponent accepted for **; stops inputs like 9^9^9 from tying up a worker
+MAX_EXPONENT = 10000
+# Largest integer result (in bits) that ** and * may produce; the exponent check alone
+# doesn't bound nested powers like (9^10000)^1000
+MAX_RESULT_BITS = 100000
+
+
+@lru_cache(maxsize=1024)
+def _parse(expr: str) -> ast.expr:
+    """Parse an expression once; repeated calculations reuse the cached tree."""
+    return ast.parse(expr, mode='eval').body
+
+
+def _check_result_size(op, left, right):
+    """Reject integer ** and * whose result would exceed MAX_RESULT_BITS, before computing it."""
+    if not (isinstance(left, int) and isinstance(right, int)):
+        return  # float/complex arithmetic is fixed-size (it overflows instead of growing)
+    if isinstance(op, ast.Pow):
+        if right > 0 and right * math.log2(max(abs(left), 2)) > MAX_RESULT_BITS:
+            raise ValueError("Result too large")
+    elif isinstance(op, ast.Mult):
+        if left.bit_length() + right.bit_length() > MAX_RESULT_BITS:
+            raise ValueError("Result too large")
+
+
+def _eval_node(node):
+    """Evaluate a whitelisted expression node: numbers, names, + - * / // % **, calls, tuples."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, complex)):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in ALLOWED_NAMES:
+        return ALLOWED_NAMES[node.id]
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        # Arithmetic is numbers-only: a tuple or string operand would turn * into
+        # unbounded sequence repetition, e.g. (1|)*10^9
+        if not (isinstance(left, NUMBER_TYPES) and isinstance(right, NUMBER_TYPES)):
+            raise TypeError("Operands must be numbers")
+        if isinstance(node.op, ast.Pow) and isinstance(right, (int, float)) and abs(right) > MAX_EXPONENT:
+            raise ValueError("Exponent too large")
+        _check_result_size(node.op, left, right)
+        return BINARY_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        return UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, ast.Call) and not node.keywords:
+        func = _eval_node(node.func)
+        if not callable(func):
+            raise TypeError("Not a function")
+        return func(*[_eval_node(arg) for arg in node.args])
+    if isinstance(node, ast.Tuple):
+        return tuple(_eval_node(elt) for elt in node.elts)
+    raise ValueError(f"Unsupported expression: {type(node).__name__}")
+
+
 @dataclass
 class Calculator:
     expression: str
@@ -15,23 +104,8 @@ class Calculator:
         expr = expr.replace('^', '**')  # Replace ^ with Python power operator
         expr = expr.replace('|', ',')  # 👈 custom delimiter fix
 
-
-        # Safe math context
-        allowed = {
-            'sqrt': math.sqrt,
-            'cbrt': lambda x: x ** (1/3),
-            'log': math.log10,
-            'ln': math.log,
-            'pi': math.pi,
-            'e': math.e,
-            # 👇 CUSTOM FUNCTIONS
-        'profit': lambda cp, sp: (sp - cp) / cp if cp != 0 else 'Error',
-        'tax': lambda amount, rate: (amount * rate / 100),
-        'markup': lambda cp, percent: cp + (cp * percent / 100),
-        }
-
         try:
-            result = eval(expr, {"__builtins__": None}, allowed)
+            result = _eval_node(_parse(expr))
             # Round to avoid floating point precision issues
             if isinstance(result, float):
                 result = round(result, 10)  # Remove tiny floating point errors
@@ -40,4 +114,4 @@ class Calculator:
                     result = int(result)  # Show 5.0 as 5
             return str(result)
         except Exception:
-            return "Error"
\ No newline at end of file
+            return "Error"
@@ -1,53 +1,68 @@
-import mysql.connector
-import os
 import config
 
-DB_HOST = config.DB_HOST
-DB_NAME = config.DB_NAME
-DB_USER = config.DB_USER
-DB_PASSWORD = config.DB_PASSWORD
-DB_PORT = int(config.DB_PORT)
-
-conn = mysql.connector.connect(
-    host=DB_HOST,
-    user=DB_USER,
-    password=DB_PASSWORD,
-    database=DB_NAME,
-    port=DB_PORT
-)
-
-cursor = conn.cursor()
-
-cursor.execute("SHOW TABLES")
-tables = cursor.fetchall()
-
-for table in tables:
-    table_name = table[0]
-    print(f"Table: {table_name}")
-    
-    cursor.execute(f"DESCRIBE {table_name}")
-    columns = cursor.fetchall()
-    print("Columns:")
-    for col in columns:
-        print(f"  {col[0]}: {col[1]}")
-    
-    cursor.execute(f"SELECT * FROM {table_name} LIMIT 5")
-    rows = cursor.fetchall()
-    print("First 5 rows:")
-    for row in rows:
-        # Truncate each column value to 100 characters
-        truncated_row = []
-        for value in row:
-            if value is not None:
-                str_value = str(value)
-                if len(str_value) > 100:
-                    truncated_row.append(str_value[:50] + "...")
-                else:
-                    truncated_row.append(str_value)
-            else:
-                truncated_row.append(None)
-        print(f"  {tuple(truncated_row)}")
-    print()
-
-cursor.close()
-conn.close()
\ No newline at end of file
+
+def main():
+    # Imported here so importing this module (e.g. during test collection) doesn't load the driver
+    import mysql.connector
+
+    DB_HOST = config.DB_HOST
+    DB_NAME = config.DB_NAME
+    DB_USER = config.DB_USER
+    DB_PASSWORD = config.DB_PASSWORD
+    DB_PORT = int(config.DB_PORT)
+
+    conn = mysql.connector.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME,
+        port=DB_PORT
+    )
+
+    cursor = conn.cursor()
+
+    cursor.execute("SHOW TABLES")
+    tables = cursor.fetchall()
+
+    # Column names/types for every table in one round trip instead of a DESCRIBE per table
+    cursor.execute(
+        "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = %s ORDER BY TABLE_NAME, ORDINAL_POSITION",
+        (DB_NAME,)
+    )
+    columns_by_table = {}
+    for table_name, column_name, column_type in cursor.fetchall():
+        # Some connector/server combinations return information_schema text as bytes
+        table_name, column_name, column_type = (
+            v.decode() if isinstance(v, (bytes, bytearray)) else v
+            for v in (table_name, column_name, column_type)
+        )
+        columns_by_table.setdefault(table_name, []).append((column_name, column_type))
+
+    for table in tables:
+        table_name = table[0]
+        print(f"Table: {table_name}")
+        
+        print("Columns:")
+        for col_name, col_type in columns_by_table.get(table_name, []):
+            print(f"  {col_name}: {col_type}")
+        
+        cursor.execute(f"SELECT * FROM {table_name} LIMIT 5")
+        rows = cursor.fetchall()
+        print("First 5 rows:")
+        for row in rows:
+            # Truncate each column value to 100 characters
+            truncated_row = [
+                None if value is None
+                else (str_value[:50] + "..." if len(str_value := str(value)) > 100 else str_value)
+                for value in row
+            ]
+            print(f"  {tuple(truncated_row)}")
+        print()
+
+    cursor.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,29 +6,56 @@ Usage: python scripts/diagnostics.py
 """
 
 import os
+import re
 import sys
 import sqlite3
 import json
+import atexit
+import itertools
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
 import platform
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from diagnostics_abasu_util import format_table
 import zipfile
 import shutil
-
-
-# Add parent directory to path for imports
+import time
+from importlib import metadata
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import yaml
+    # libyaml's C loader when PyYAML was built with it
+    YamlSafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+try:
+    import tomllib
+    TOMLLIB_AVAILABLE = True
+except ImportError:
+    TOMLLIB_AVAILABLE = False
+
+
+# Directory containing this script (diagnostics_abasu_util is imported from here via sys.path[0])
 BASE_DIR = Path(__file__).resolve().parent
 # Session-scoped working directory that can be updated via Settings
 SESSION_BASE_DIR = BASE_DIR
-sys.path.insert(0, str(BASE_DIR.parent))
 
 
 # ============================================================================
 # GLOBAL INPUT QUEUE FOR BATCH OPERATIONS
 # ============================================================================
-INPUT_QUEUE = []
+INPUT_QUEUE = deque()
 
 def parse_input_chain(chain_str: str):
     """Parse input chain string into queue.
@@ -38,31 +65,31 @@ def parse_input_chain(chain_str: str):
     - 'y' separator: "3y3y20y" or "3y3y20"
     - Space-separated: "3 3 20"
     """
-    global INPUT_QUEUE
-    
     # Remove trailing separators
     chain_str = chain_str.strip().rstrip(',y ')
     
     # Try different delimiters
     if ',' in chain_str:
-        INPUT_QUEUE = [x.strip() for x in chain_str.split(',') if x.strip()]
+        parsed = [x.strip() for x in chain_str.split(',') if x.strip()]
     elif 'y' in chain_str.lower():
-        INPUT_QUEUE = [x.strip() for x in chain_str.lower().split('y') if x.strip()]
+        parsed = [x.strip() for x in chain_str.lower().split('y') if x.strip()]
     elif ' ' in chain_str and len(chain_str.split()) > 1:
-        INPUT_QUEUE = [x.strip() for x in chain_str.split() if x.strip()]
+        parsed = [x.strip() for x in chain_str.split() if x.strip()]
     else:
         # Single value
-        INPUT_QUEUE = [chain_str.strip()] if chain_str.strip() else []
+        parsed = [chain_str.strip()] if chain_str.strip() else []
+    
+    INPUT_QUEUE.clear()
+    INPUT_QUEUE.extend(parsed)
     
     if INPUT_QUEUE:
         print_info(f"Input queue loaded: {' -> '.join(INPUT_QUEUE)}")
 
 def smart_input(prompt: str) -> str:
     """Smart input wrapper that uses queue if available, otherwise prompts user"""
-    global INPUT_QUEUE
-    
     if INPUT_QUEUE:
-        value = INPUT_QUEUE.pop(0)
+        # deque.popleft is O(1); list.pop(0) shifted the whole remaining chain
+        value = INPUT_QUEUE.popleft()
         print(f"{prompt}{Colors.WARNING}{value}{Colors.ENDC}  {Colors.OKBLUE}[auto]{Colors.ENDC}")
         return value
     
@@ -85,6 +112,16 @@ MAIN_EXCLUSION_LIST= [
 ZIP_EXCLUSIONS = MAIN_EXCLUSION_LIST + [
     '*.zip', '*.tar', '*.gz', '*.7z', '*.rar', '*.iso'
 ]
+
+
+def split_exclusions(exclusion_list: List[str]) -> Tuple[frozenset, frozenset]:
+    """Split an exclusion list into ('*.ext' suffixes, literal file/dir names) sets."""
+    suffixes = frozenset(e[1:] for e in exclusion_list if e.startswith('*.'))
+    names = frozenset(e for e in exclusion_list if not e.startswith('*.'))
+    return suffixes, names
+
+
+ZIP_EXCLUDED_SUFFIXES, ZIP_EXCLUDED_NAMES = split_exclusions(ZIP_EXCLUSIONS)
 #----------------------------------------------------------------------------
 def ensure_working_directory():
     """Ensure the script runs from its own directory (Explorer double-click fix)."""
@@ -137,26 +174,58 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+def _enable_ansi_clear() -> bool:
+    """Return True if stdout is a terminal that understands ANSI clear sequences.
+
+    On Windows this also switches the console into VT mode once, so later clears
+    don't need to spawn ``cls``.
+    """
+    try:
+        if not sys.stdout.isatty():
+            return False
+        if os.name != 'nt':
+            return True
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
+ANSI_CLEAR_SUPPORTED = _enable_ansi_clear()
+
+
 def clear_screen():
     """Clear terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if ANSI_CLEAR_SUPPORTED:
+        # Clear screen + scrollback and home the cursor without forking a shell
+        sys.stdout.write('\033[2J\033[3J\033[H')
+        sys.stdout.flush()
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+
+# Action keywords highlighted in menu text, matched in one pass (longest first)
+HIGHLIGHT_KEYWORDS = [
+    'Delete', 'Copy', 'Duplicate', 'Zip', 'ZIP', 'Unzip', 'Extract',
+    'Create', 'Add', 'Remove', 'Modify', 'View', 'Show', 'Display',
+    'Search', 'Scan', 'Rescan', 'Edit', 'Rename', 'Move'
+]
+HIGHLIGHT_KEYWORDS_RE = re.compile(
+    '|'.join(re.escape(k) for k in sorted(HIGHLIGHT_KEYWORDS, key=len, reverse=True))
+)
 
 
+@lru_cache(maxsize=256)
 def highlight_keywords(text: str) -> str:
     """Highlight action keywords in menu text for better visibility"""
-    keywords = [
-        'Delete', 'Copy', 'Duplicate', 'Zip', 'ZIP', 'Unzip', 'Extract',
-        'Create', 'Add', 'Remove', 'Modify', 'View', 'Show', 'Display',
-        'Search', 'Scan', 'Rescan', 'Edit', 'Rename', 'Move'
-    ]
-    
-    result = text
-    for keyword in keywords:
-        # Highlight the keyword with WARNING color (yellow/orange) for visibility
-        if keyword in result:
-            result = result.replace(keyword, f"{Colors.WARNING}{keyword}{Colors.ENDC}")
-    
-    return result
+    # Highlight each keyword with WARNING color (yellow/orange) for visibility
+    return HIGHLIGHT_KEYWORDS_RE.sub(lambda m: f"{Colors.WARNING}{m.group(0)}{Colors.ENDC}", text)
 
 
 def print_header(text: str):
@@ -166,24 +235,66 @@ def print_header(text: str):
     print(f"{'=' * 70}{Colors.ENDC}\n")
 
 
+# Message prefixes/suffix for the print_* helpers, built once
+SUCCESS_PREFIX = f"{Colors.OKGREEN}✓ "
+ERROR_PREFIX = f"{Colors.FAIL}✗ "
+WARNING_PREFIX = f"{Colors.WARNING}⚠ "
+INFO_PREFIX = f"{Colors.OKCYAN}ℹ "
+MESSAGE_END = Colors.ENDC
+
+
 def print_success(text: str):
     """Print success message"""
-    print(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+    print(SUCCESS_PREFIX + str(text) + MESSAGE_END)
 
 
 def print_error(text: str):
     """Print error message"""
-    print(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
+    print(ERROR_PREFIX + str(text) + MESSAGE_END)
 
 
 def print_warning(text: str):
     """Print warning message"""
-    print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+    print(WARNING_PREFIX + str(text) + MESSAGE_END)
 
 
 def print_info(text: str):
     """Print info message"""
-    print(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
+    print(INFO_PREFIX + str(text) + MESSAGE_END)
+
+
+def write_lines(lines: List[str]):
+    """Write a block of output lines with a single write and flush, rather than
+    one print() call (and, on a terminal, one write syscall) per line"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+
+# Status-bar values that can't change while the tool is running
+PYTHON_VERSION = platform.python_version()
+CURRENT_OS = platform.system()
+OS_INFO = f"{CURRENT_OS} {platform.release()}"
+# Separator between PATH entries (';' on Windows, ':' elsewhere)
+PATH_SEPARATOR = os.pathsep
+STATUS_BAR_SEPARATOR = f"{Colors.OKCYAN}{'─' * 70}{Colors.ENDC}"
+
+# (monotonic time, directory, free bytes) of the last disk_usage call made for the status bar
+_LAST_DISK_FREE = (0.0, None, None)
+DISK_FREE_CACHE_SECONDS = 1.0
+
+
+def _get_disk_free(directory: Path):
+    """Free bytes on directory's disk, reused for up to a second across menu redraws."""
+    global _LAST_DISK_FREE
+    if not PSUTIL_AVAILABLE:
+        return None
+    checked_at, checked_dir, free = _LAST_DISK_FREE
+    now = time.monotonic()
+    if checked_dir != directory or now - checked_at > DISK_FREE_CACHE_SECONDS:
+        free = psutil.disk_usage(str(directory)).free
+        _LAST_DISK_FREE = (now, directory, free)
+    return free
 
 
 def print_status_bar():
@@ -191,28 +302,21 @@ def print_status_bar():
     try:
         current_dir = Path.cwd()
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        python_ver = platform.python_version()
-        
-        # Get OS information
-        os_name = platform.system()
-        os_release = platform.release()
-        os_info = f"{os_name} {os_release}"
         
         # Get disk usage if psutil is available
         disk_info = ""
         try:
-            import psutil
-            disk = psutil.disk_usage(str(current_dir))
-            disk_free_gb = disk.free / (1024**3)
-            disk_info = f" | Disk Free: {disk_free_gb:.1f} GB"
+            disk_free = _get_disk_free(current_dir)
+            if disk_free is not None:
+                disk_info = f" | Disk Free: {disk_free / (1024**3):.1f} GB"
         except:
             pass
         
-        print(f"{Colors.OKCYAN}{'─' * 70}{Colors.ENDC}")
+        print(STATUS_BAR_SEPARATOR)
         print(f"{Colors.BOLD}[DIR] Folder:{Colors.ENDC} {current_dir}")
-        print(f"{Colors.BOLD}Time:{Colors.ENDC} {current_time} | {Colors.BOLD}OS:{Colors.ENDC} {os_info}")
-        print(f"{Colors.BOLD}Python:{Colors.ENDC} {python_ver}{disk_info}")
-        print(f"{Colors.OKCYAN}{'─' * 70}{Colors.ENDC}")
+        print(f"{Colors.BOLD}Time:{Colors.ENDC} {current_time} | {Colors.BOLD}OS:{Colors.ENDC} {OS_INFO}")
+        print(f"{Colors.BOLD}Python:{Colors.ENDC} {PYTHON_VERSION}{disk_info}")
+        print(STATUS_BAR_SEPARATOR)
     except Exception as e:
         print_warning(f"Error displaying status bar: {str(e)}")
 
@@ -221,66 +325,376 @@ def print_status_bar():
 # DATABASE OPERATIONS
 # ============================================================================
 
-def find_sqlite_databases(root_path: Path = None) -> List[Dict]:
+# Common SQLite extensions
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3', '.db3')
+# First 16 bytes of every SQLite 3 database file
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Directories never entered by the SQLite scan: VCS metadata, virtualenvs, dependency and
+# tool caches and build output hold huge numbers of files but no user databases
+SQLITE_SCAN_PRUNE_DIRS = frozenset({
+    '.git', 'node_modules', '.venv', 'venv', 'env', '__pycache__', '.tox',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache', 'dist', 'build', 'target',
+    '.next', '.cache',
+})
+
+# Read-only connections reused by every database helper, keyed by path
+_CONN_CACHE: Dict[str, sqlite3.Connection] = {}
+# One reusable cursor per cached connection, for helpers that fetch their whole result
+_CURSOR_CACHE: Dict[str, sqlite3.Cursor] = {}
+# Compiled statements kept per connection (sqlite3's default is 128); discovery and
+# the search helpers issue many distinct PRAGMA/COUNT/search statements
+CACHED_STATEMENTS = 256
+
+
+# Tables counted per UNION ALL statement (SQLite's default compound-SELECT limit is 500)
+COUNT_BATCH_SIZE = 200
+
+
+# Tuning applied to each cached connection. They are read-only, so journal_mode and
+# synchronous (write-side settings) are left alone.
+READ_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",      # sorts/temp b-trees for searches stay in RAM
+    "PRAGMA cache_size=-262144",     # up to 256 MB page cache (allocated only as used)
+    "PRAGMA mmap_size=1073741824",   # read pages through a 1 GB memory map instead of read()
+)
+
+
+# Rows pulled from SQLite per fetchmany() call, and rows shown per page of results
+FETCH_BATCH_SIZE = 1000
+DISPLAY_PAGE_SIZE = 200
+
+
+def _iter_rows(cursor: sqlite3.Cursor) -> Iterator[Tuple]:
+    """Yield a cursor's rows in fetchmany batches so large results are never held in memory at once.
+
+    The cursor is closed when the rows run out or the iterator is closed early, which
+    finishes its statement on the (cached, shared) connection.
+    """
+    try:
+        while True:
+            batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not batch:
+                return
+            yield from batch
+    finally:
+        cursor.close()
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a table/column name for SQL, doubling any embedded double quotes."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _conn(db_path) -> sqlite3.Connection:
+    """Return a cached read-only connection to db_path, opening it on first use."""
+    key = str(db_path)
+    conn = _CONN_CACHE.get(key)
+    if conn is None:
+        # mode=ro never creates the file or journal sidecars; as_uri() escapes ?, # and spaces
+        uri = f"{Path(key).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+        for pragma in READ_CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        _CONN_CACHE[key] = conn
+    return conn
+
+
+def _cursor(db_path) -> sqlite3.Cursor:
+    """Return the reusable cursor of db_path's cached connection.
+
+    Only for queries whose rows are fully fetched before the next execute; results that
+    are streamed (see _iter_rows) need a cursor of their own.
+    """
+    key = str(db_path)
+    cursor = _CURSOR_CACHE.get(key)
+    if cursor is None:
+        cursor = _conn(key).cursor()
+        _CURSOR_CACHE[key] = cursor
+    return cursor
+
+
+def _discard_conn(db_path):
+    """Close and forget the cached connection for db_path, if any."""
+    key = str(db_path)
+    _CURSOR_CACHE.pop(key, None)
+    conn = _CONN_CACHE.pop(key, None)
+    if conn is not None:
+        conn.close()
+    # Full-text indexes lived in that connection's attached memory database
+    for fts_key in [k for k in _FTS_INDEXES if k[0] == key]:
+        del _FTS_INDEXES[fts_key]
+
+
+# Column names per (db path, table), filled by the scan and reused by the row/search helpers
+_COLUMNS_CACHE: Dict[Tuple[str, str], List[str]] = {}
+
+
+def _table_columns(db_path, table: str) -> List[str]:
+    """Return the column names of table, querying PRAGMA table_info only once per table."""
+    key = (str(db_path), table)
+    columns = _COLUMNS_CACHE.get(key)
+    if columns is None:
+        cursor = _conn(db_path).execute("SELECT * FROM pragma_table_info(?)", (table,))
+        columns = [row[1] for row in cursor.fetchall()]
+        _COLUMNS_CACHE[key] = columns
+    return columns
+
+
+# Columns usable for an index range scan per (db path, table): TEXT-affinity columns that
+# lead a BINARY-collated index
+_INDEXED_TEXT_COLUMNS_CACHE: Dict[Tuple[str, str], frozenset] = {}
+
+
+def _indexed_text_columns(db_path, table: str) -> frozenset:
+    """Return the TEXT-affinity columns of table that are the first key of a BINARY index."""
+    key = (str(db_path), table)
+    indexed = _INDEXED_TEXT_COLUMNS_CACHE.get(key)
+    if indexed is None:
+        conn = _conn(db_path)
+        text_columns = set()
+        for row in conn.execute("SELECT * FROM pragma_table_info(?)", (table,)):
+            declared = (row[2] or '').upper()
+            if 'INT' not in declared and any(t in declared for t in ('CHAR', 'CLOB', 'TEXT')):
+                text_columns.add(row[1])
+        leading = set()
+        for index_row in conn.execute("SELECT * FROM pragma_index_list(?)", (table,)).fetchall():
+            # index_xinfo rows: (seqno, cid, name, desc, coll, key); seqno 0 is the leading key
+            for info in conn.execute("SELECT * FROM pragma_index_xinfo(?)", (index_row[1],)):
+                if info[0] == 0 and info[5] and (info[4] or 'BINARY').upper() == 'BINARY':
+                    leading.add(info[2])
+        indexed = frozenset(text_columns & leading)
+        _INDEXED_TEXT_COLUMNS_CACHE[key] = indexed
+    return indexed
+
+
+def _glob_escape(value: str) -> str:
+    """Escape GLOB metacharacters so value matches literally."""
+    return ''.join(f'[{ch}]' if ch in '*?[' else ch for ch in value)
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix, for a
+    `>= prefix AND < bound` range; None if there is none (prefix is all U+10FFFF).
+
+    The last character is incremented, skipping the surrogate block (U+D800-U+DFFF
+    can't be encoded for binding) and carrying into the previous character past U+10FFFF.
+    """
+    chars = list(prefix)
+    while chars:
+        code = ord(chars.pop()) + 1
+        if code == 0xD800:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return ''.join(chars) + chr(code)
+    return None
+
+
+def _like_escape(value: str) -> str:
+    """Escape LIKE metacharacters (for use with ESCAPE '\\') so value matches literally."""
+    return ''.join(f'\\{ch}' if ch in '%_\\' else ch for ch in value)
+
+
+@lru_cache(maxsize=256)
+def _column_search_sql(table: str, column: str, mode: str, n_terms: int = 1) -> str:
+    """Build (once per shape) the search_by_column SQL; the identical text also lets
+    sqlite3's statement cache reuse the compiled statement on repeat searches."""
+    qt, qc = _quote_identifier(table), _quote_identifier(column)
+    if mode == 'range':
+        where = f"{qc} >= ? AND {qc} < ?"
+    elif mode == 'glob':
+        where = f"{qc} GLOB ?"
+    elif mode == 'fuzzy':
+        where = " AND ".join([f"{qc} LIKE ? COLLATE NOCASE"] * n_terms)
+    else:
+        where = f"{qc} LIKE ?"
+    return f"SELECT * FROM {qt} WHERE {where}"
+
+
+@lru_cache(maxsize=256)
+def _all_columns_search_sql(table: str, columns: Tuple[str, ...], n_terms: int) -> str:
+    """Build (once per shape) the search_all_columns scan SQL."""
+    row_text = _row_text_expr(columns)
+    conditions = [f"{row_text} LIKE ? ESCAPE '\\' COLLATE NOCASE"] * n_terms
+    return f"SELECT * FROM {_quote_identifier(table)} WHERE {' OR '.join(conditions)}"
+
+
+def _row_text_expr(columns: List[str]) -> str:
+    """SQL for a row's text: columns joined by CHAR(31) (unit separator) so a search
+    term can't match across two columns."""
+    return "(" + " || CHAR(31) || ".join(
+        f"IFNULL(CAST({_quote_identifier(col)} AS TEXT), '')" for col in columns
+    ) + ")"
+
+
+# In-memory trigram FTS5 indexes for search_all_columns, built on first search of a table:
+# (db path, table) -> (index name in the attached 'ftsmem' database, PRAGMA data_version)
+_FTS_INDEXES: Dict[Tuple[str, str], Tuple[Optional[str], int]] = {}
+_FTS_INDEX_IDS = itertools.count()
+# Trigram FTS5 can only match terms of at least 3 characters
+FTS_MIN_TERM_LENGTH = 3
+
+
+def _fts_index(db_path, table: str, columns: List[str]) -> Optional[str]:
+    """Return the name of an in-memory trigram index over table's rows, (re)building it when
+    the database has changed since it was built. Returns None when FTS5/trigram isn't
+    available or the table has no rowid."""
+    key = (str(db_path), table)
+    conn = _conn(db_path)
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    cached = _FTS_INDEXES.get(key)
+    if cached and cached[1] == data_version:
+        return cached[0]
+    
+    name = (cached and cached[0]) or f"idx_{next(_FTS_INDEX_IDS)}"
+    try:
+        if not any(row[1] == 'ftsmem' for row in conn.execute("PRAGMA database_list")):
+            conn.execute("ATTACH DATABASE ':memory:' AS ftsmem")
+        conn.execute(f"DROP TABLE IF EXISTS ftsmem.{name}")
+        conn.execute(f"CREATE VIRTUAL TABLE ftsmem.{name} USING fts5(content, tokenize='trigram')")
+        conn.execute(
+            f"INSERT INTO ftsmem.{name}(rowid, content) "
+            f"SELECT rowid, {_row_text_expr(columns)} FROM main.{_quote_identifier(table)}"
+        )
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        # Remember the failure for this data_version so the search doesn't retry the build
+        name = None
+    _FTS_INDEXES[key] = (name, data_version)
+    return name
+
+
+@atexit.register
+def _close_cached_connections():
+    _CURSOR_CACHE.clear()
+    for conn in _CONN_CACHE.values():
+        conn.close()
+    _CONN_CACHE.clear()
+    _FTS_INDEXES.clear()
+
+
+def _iter_sqlite_candidates(root_path: Path, prune: Iterable[str] = SQLITE_SCAN_PRUNE_DIRS):
+    """Yield (path, size) for files under root_path with a SQLite extension, in one directory walk.
+
+    Directories whose name is in prune are skipped without being entered.
+    """
+    stack = [str(root_path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in prune:
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(SQLITE_EXTENSIONS) and entry.is_file():
+                        yield Path(entry.path), entry.stat().st_size
+        except OSError:
+            continue
+
+
+def _is_sqlite_file(db_file: Path) -> bool:
+    """Cheap check that a file starts with the SQLite header, before opening it with sqlite3."""
+    try:
+        with open(db_file, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def _probe_db(db_file: Path, size: int) -> Optional[Dict]:
+    """Read the table/column/row-count summary of one candidate file, or None if it isn't SQLite."""
+    # Backups, swap files and other non-databases with a SQLite extension are rejected with
+    # a 16-byte read instead of a full sqlite3 open
+    if not _is_sqlite_file(db_file):
+        return None
+    try:
+        # Verify it's actually a SQLite database
+        cursor = _cursor(db_file)
+        
+        # Get tables
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        tables = [row[0] for row in cursor.fetchall()]
+        
+        # Columns of every table in one query via the table-valued pragma function
+        columns_by_table = {table: [] for table in tables}
+        cursor.execute(
+            "SELECT m.name, p.name FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+            "WHERE m.type='table' ORDER BY m.name, p.cid"
+        )
+        for table, column in cursor.fetchall():
+            columns_by_table[table].append(column)
+        
+        # Row counts batched into UNION ALL queries (chunked below SQLite's compound-SELECT limit)
+        row_counts = {}
+        for start in range(0, len(tables), COUNT_BATCH_SIZE):
+            batch = tables[start:start + COUNT_BATCH_SIZE]
+            cursor.execute(" UNION ALL ".join(
+                f"SELECT {start + i}, COUNT(*) FROM {_quote_identifier(table)}"
+                for i, table in enumerate(batch)
+            ))
+            for table_idx, row_count in cursor.fetchall():
+                row_counts[tables[table_idx]] = row_count
+        
+        table_info = {}
+        for table in tables:
+            columns = columns_by_table[table]
+            _COLUMNS_CACHE[(str(db_file), table)] = columns
+            table_info[table] = {
+                'columns': columns,
+                'row_count': row_counts[table]
+            }
+        
+        return {
+            'path': str(db_file),
+            'name': db_file.name,
+            'size': size,
+            'tables': table_info
+        }
+        
+    except sqlite3.Error:
+        # Not a valid SQLite database
+        _discard_conn(db_file)
+        return None
+    except Exception as e:
+        _discard_conn(db_file)
+        print_warning(f"Error reading {db_file.name}: {str(e)}")
+        return None
+
+
+def find_sqlite_databases(root_path: Path = None, prune: Iterable[str] = SQLITE_SCAN_PRUNE_DIRS) -> List[Dict]:
     """
     Recursively find all SQLite database files from root_path.
     
+    Args:
+        root_path: Directory to scan (defaults to the current directory)
+        prune: Directory names not to descend into (defaults to SQLITE_SCAN_PRUNE_DIRS)
+    
     Returns:
         List of dicts with db info: {path, name, size, tables}
     """
     if root_path is None:
         root_path = Path.cwd()
     
-    databases = []
-    
     print_info(f"Scanning for SQLite databases from: {root_path}")
     
-    # Common SQLite extensions
-    extensions = ['.db', '.sqlite', '.sqlite3', '.db3']
-    
-    for ext in extensions:
-        for db_file in root_path.rglob(f'*{ext}'):
-            try:
-                # Verify it's actually a SQLite database
-                conn = sqlite3.connect(db_file)
-                cursor = conn.cursor()
-                
-                # Get tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                tables = [row[0] for row in cursor.fetchall()]
-                
-                # Get columns for each table
-                table_info = {}
-                for table in tables:
-                    cursor.execute(f"PRAGMA table_info({table})")
-                    columns = [row[1] for row in cursor.fetchall()]
-                    
-                    # Get row count
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    row_count = cursor.fetchone()[0]
-                    
-                    table_info[table] = {
-                        'columns': columns,
-                        'row_count': row_count
-                    }
-                
-                conn.close()
-                
-                databases.append({
-                    'path': str(db_file),
-                    'name': db_file.name,
-                    'size': db_file.stat().st_size,
-                    'tables': table_info
-                })
-                
-            except sqlite3.Error:
-                # Not a valid SQLite database
-                continue
-            except Exception as e:
-                print_warning(f"Error reading {db_file.name}: {str(e)}")
-                continue
+    candidates = list(_iter_sqlite_candidates(root_path, frozenset(prune)))
+    if not candidates:
+        return []
     
-    return databases
+    # Each file is independent and SQLite readers don't block each other, so probe them
+    # concurrently; map() keeps results in walk order
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(candidates))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda candidate: _probe_db(*candidate), candidates)
+        return [db for db in results if db is not None]
+
+
+# Colored line templates for the database listing/statistics output, composed once
+DB_ENTRY_FMT = f"\n{Colors.BOLD}[{{idx}}] {{name}}{Colors.ENDC}"
+DB_TABLE_FMT = f"\n    📊 Table: {Colors.OKBLUE}{{table}}{Colors.ENDC} ({{rows}} rows)"
+STATS_TABLE_FMT = f"\n  {Colors.OKBLUE}{{table}}{Colors.ENDC}"
+TABLE_HEADER_FMT = f"\n{Colors.BOLD}{{header}}{Colors.ENDC}"
 
 
 def display_database_structure(databases: List[Dict]):
@@ -291,32 +705,30 @@ def display_database_structure(databases: List[Dict]):
     
     print_header(f"Found {len(databases)} SQLite Database(s)")
     
+    out = []
     for idx, db in enumerate(databases, 1):
         size_mb = db['size'] / (1024 * 1024)
-        print(f"\n{Colors.BOLD}[{idx}] {db['name']}{Colors.ENDC}")
-        print(f"    Path: {db['path']}")
-        print(f"    Size: {size_mb:.2f} MB")
-        print(f"    Tables: {len(db['tables'])}")
+        out.append(DB_ENTRY_FMT.format(idx=idx, name=db['name']))
+        out.append(f"    Path: {db['path']}")
+        out.append(f"    Size: {size_mb:.2f} MB")
+        out.append(f"    Tables: {len(db['tables'])}")
         
         for table_name, table_data in db['tables'].items():
-            print(f"\n    📊 Table: {Colors.OKBLUE}{table_name}{Colors.ENDC} ({table_data['row_count']} rows)")
-            print(f"       Columns: {', '.join(table_data['columns'])}")
+            out.append(DB_TABLE_FMT.format(table=table_name, rows=table_data['row_count']))
+            out.append(f"       Columns: {', '.join(table_data['columns'])}")
+    write_lines(out)
 
 
 def get_first_n_rows(db_path: str, table: str, n: int = 5):
     """Get first N rows from a table"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = _cursor(db_path)
         
-        cursor.execute(f"SELECT * FROM {table} LIMIT {n}")
+        cursor.execute(f"SELECT * FROM {_quote_identifier(table)} LIMIT ?", (n,))
         rows = cursor.fetchall()
         
         # Get column names
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        conn.close()
+        columns = _table_columns(db_path, table)
         
         return columns, rows
     except Exception as e:
@@ -327,23 +739,22 @@ def get_first_n_rows(db_path: str, table: str, n: int = 5):
 def get_last_n_rows(db_path: str, table: str, n: int = 5):
     """Get last N rows from a table"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = _cursor(db_path)
         
-        # Get total count
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        total = cursor.fetchone()[0]
-        
-        # Get last N rows
-        offset = max(0, total - n)
-        cursor.execute(f"SELECT * FROM {table} LIMIT {n} OFFSET {offset}")
-        rows = cursor.fetchall()
-        
-        # Get column names
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [row[1] for row in cursor.fetchall()]
+        try:
+            # Walk the rowid B-tree backwards so only N rows are read, then restore ascending order
+            cursor.execute(f"SELECT * FROM {_quote_identifier(table)} ORDER BY rowid DESC LIMIT ?", (n,))
+            rows = cursor.fetchall()[::-1]
+        except sqlite3.OperationalError:
+            # WITHOUT ROWID tables have no rowid; fall back to counting and skipping
+            cursor.execute(f"SELECT COUNT(*) FROM {_quote_identifier(table)}")
+            total = cursor.fetchone()[0]
+            
+            offset = max(0, total - n)
+            cursor.execute(f"SELECT * FROM {_quote_identifier(table)} LIMIT ? OFFSET ?", (n, offset))
+            rows = cursor.fetchall()
         
-        conn.close()
+        columns = _table_columns(db_path, table)
         
         return columns, rows
     except Exception as e:
@@ -354,35 +765,36 @@ def get_last_n_rows(db_path: str, table: str, n: int = 5):
 def search_by_column(db_path: str, table: str, column: str, search_value: str, fuzzy: bool = False):
     """Search for rows where column matches search_value with fuzzy matching options"""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _conn(db_path)
         cursor = conn.cursor()
         
         # Get column names
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        if fuzzy:
-            # Fuzzy search: case-insensitive, space-insensitive
-            # Remove spaces and make case-insensitive for better matching
-            search_terms = search_value.lower().split()
-            
-            # Build query with multiple LIKE conditions for each term
-            conditions = []
-            params = []
-            for term in search_terms:
-                conditions.append(f"LOWER({column}) LIKE ?")
-                params.append(f'%{term}%')
+        columns = _table_columns(db_path, table)
+        
+        prefix = search_value[:-1] if search_value.endswith('*') else None
+        if prefix:
+            # Prefix search ("abc*", case-sensitive). On an indexed text column a
+            # half-open range lets SQLite seek the index instead of scanning the table.
+            upper = _prefix_upper_bound(prefix)
+            if upper is not None and column in _indexed_text_columns(db_path, table):
+                cursor.execute(_column_search_sql(table, column, 'range'), (prefix, upper))
+            else:
+                cursor.execute(_column_search_sql(table, column, 'glob'), (_glob_escape(prefix) + '*',))
+        elif fuzzy:
+            # Fuzzy search: case-insensitive, space-insensitive. Terms are matched
+            # with LIKE ... COLLATE NOCASE rather than LOWER(column), so no per-row
+            # function call is needed and a column indexed with COLLATE NOCASE can
+            # serve the match
+            search_terms = search_value.split()
             
-            query = f"SELECT * FROM {table} WHERE {' AND '.join(conditions)}"
-            cursor.execute(query, params)
+            # Query with one LIKE condition per term
+            params = [f'%{term}%' for term in search_terms]
+            cursor.execute(_column_search_sql(table, column, 'fuzzy', len(params)), params)
         else:
             # Standard search with LIKE for partial matches
-            query = f"SELECT * FROM {table} WHERE {column} LIKE ?"
-            cursor.execute(query, (f'%{search_value}%',))
+            cursor.execute(_column_search_sql(table, column, 'like'), (f'%{search_value}%',))
         
-        rows = cursor.fetchall()
-        
-        conn.close()
+        rows = _iter_rows(cursor)
         
         return columns, rows
     except Exception as e:
@@ -393,28 +805,33 @@ def search_by_column(db_path: str, table: str, column: str, search_value: str, f
 def search_all_columns(db_path: str, table: str, search_value: str):
     """Search for rows where ANY column matches search_value"""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _conn(db_path)
         cursor = conn.cursor()
         
         # Get column names
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [row[1] for row in cursor.fetchall()]
+        columns = _table_columns(db_path, table)
         
-        # Build query to search across all columns
         search_terms = search_value.lower().split()
-        conditions = []
-        params = []
-        
-        for col in columns:
-            for term in search_terms:
-                conditions.append(f"LOWER(CAST({col} AS TEXT)) LIKE ?")
-                params.append(f'%{term}%')
-        
-        query = f"SELECT * FROM {table} WHERE {' OR '.join(conditions)}"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
         
-        conn.close()
+        # Repeat searches are answered from a trigram full-text index over the rows
+        # (built on the first search) instead of scanning every column again
+        fts_name = None
+        if search_terms and all(len(term) >= FTS_MIN_TERM_LENGTH for term in search_terms):
+            fts_name = _fts_index(db_path, table, columns)
+        
+        if fts_name:
+            match = " OR ".join('"' + term.replace('"', '""') + '"' for term in search_terms)
+            query = (
+                f"SELECT * FROM {_quote_identifier(table)} WHERE rowid IN "
+                f"(SELECT rowid FROM ftsmem.{fts_name} WHERE {fts_name} MATCH ?)"
+            )
+            cursor.execute(query, (match,))
+        else:
+            # Search across all columns: join the row's text once and test each term
+            # against it with a case-insensitive LIKE
+            query = _all_columns_search_sql(table, tuple(columns), len(search_terms))
+            cursor.execute(query, [f'%{_like_escape(term)}%' for term in search_terms])
+        rows = _iter_rows(cursor)
         
         return columns, rows
     except Exception as e:
@@ -422,70 +839,120 @@ def search_all_columns(db_path: str, table: str, search_value: str):
         return None, None
 
 
-def display_table_data(columns: List[str], rows: List[Tuple]):
-    """Display table data in a formatted way using util.format_table"""
-    if not rows:
+def display_table_data(columns: List[str], rows: Iterable[Tuple]):
+    """Display table data in a formatted way using util.format_table.
+
+    rows may be a list or a lazy iterator (see _iter_rows); it is consumed one page of
+    DISPLAY_PAGE_SIZE rows at a time, asking before each further page.
+    """
+    rows_iter = iter(rows)
+    total_rows = 0
+    
+    while True:
+        page = list(itertools.islice(rows_iter, DISPLAY_PAGE_SIZE))
+        if not page:
+            break
+        if total_rows:
+            more = smart_input(f"\n{Colors.OKCYAN}Shown {total_rows} rows. Enter for more, q to stop: {Colors.ENDC}")
+            if more.strip().lower() == 'q':
+                # Finish the underlying statement so the cached connection isn't left mid-read
+                getattr(rows_iter, 'close', lambda: None)()
+                break
+        total_rows += len(page)
+        
+        # Use the shared formatting helper
+        table = format_table(rows=page, headers=list(columns), padding=3, align=None, truncate=True)
+        lines = table.splitlines()
+        if not lines:
+            continue
+        
+        # Print header (bold) then the rest normally, as one write per page
+        lines[0] = TABLE_HEADER_FMT.format(header=lines[0])
+        write_lines(lines)
+    
+    if not total_rows:
         print_warning("No data found!")
         return
+    
+    print(f"\n{Colors.OKGREEN}Total rows: {total_rows}{Colors.ENDC}")
 
-    # Use the shared formatting helper
-    table = format_table(rows=rows, headers=list(columns), padding=3, align=None, truncate=True)
-    lines = table.splitlines()
-    if not lines:
-        return
 
-    # Print header (bold) then the rest normally
-    print(f"\n{Colors.BOLD}{lines[0]}{Colors.ENDC}")
-    for line in lines[1:]:
-        print(line)
+def _sample_rows(cursor: sqlite3.Cursor, tables: Dict[str, Dict]) -> Dict[str, Optional[Tuple]]:
+    """First row of every table (None for empty tables), keyed by table name.
+
+    Rows are fetched as json_array()s in UNION ALL batches, so the differing table shapes
+    fit one result set; if that fails (BLOB values, no JSON support) each table is read
+    on its own instead.
+    """
+    names = list(tables)
+    samples = {}
+    try:
+        for start in range(0, len(names), COUNT_BATCH_SIZE):
+            batch = names[start:start + COUNT_BATCH_SIZE]
+            cursor.execute(" UNION ALL ".join(
+                f"SELECT {start + i}, (SELECT json_array("
+                f"{', '.join(_quote_identifier(col) for col in tables[table]['columns'])}"
+                f") FROM {_quote_identifier(table)} LIMIT 1)"
+                for i, table in enumerate(batch)
+            ))
+            for table_idx, sample in cursor.fetchall():
+                samples[names[table_idx]] = tuple(json.loads(sample)) if sample is not None else None
+        return samples
+    except sqlite3.Error:
+        samples = {}
     
-    print(f"\n{Colors.OKGREEN}Total rows: {len(rows)}{Colors.ENDC}")
+    for table in names:
+        try:
+            cursor.execute(f"SELECT * FROM {_quote_identifier(table)} LIMIT 1")
+            samples[table] = cursor.fetchone()
+        except sqlite3.Error:
+            samples[table] = None
+    return samples
 
 
 def get_generic_database_stats(db_path: str, db_info: Dict):
     """Get generic statistics from any database"""
     print_header(f"DATABASE STATISTICS: {db_info['name']}")
     
+    out = []
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = _cursor(db_path)
         
         # Database size
         size_mb = db_info['size'] / (1024 * 1024)
-        print(f"{Colors.BOLD}Database Size:{Colors.ENDC} {size_mb:.2f} MB")
-        print(f"{Colors.BOLD}Total Tables:{Colors.ENDC} {len(db_info['tables'])}")
+        out.append(f"{Colors.BOLD}Database Size:{Colors.ENDC} {size_mb:.2f} MB")
+        out.append(f"{Colors.BOLD}Total Tables:{Colors.ENDC} {len(db_info['tables'])}")
+        
+        # Sample data for every table (first row), fetched in batched queries
+        samples = _sample_rows(cursor, db_info['tables'])
         
         # Table statistics
-        print(f"\n{Colors.BOLD}Table Statistics:{Colors.ENDC}")
+        out.append(f"\n{Colors.BOLD}Table Statistics:{Colors.ENDC}")
         total_rows = 0
         for table_name, table_data in db_info['tables'].items():
             row_count = table_data['row_count']
             col_count = len(table_data['columns'])
             total_rows += row_count
             
-            print(f"\n  {Colors.OKBLUE}{table_name}{Colors.ENDC}")
-            print(f"    Rows: {row_count:,}")
-            print(f"    Columns: {col_count}")
-            print(f"    Column Names: {', '.join(table_data['columns'][:5])}" + 
-                  (f"... (+{col_count-5} more)" if col_count > 5 else ""))
+            out.append(STATS_TABLE_FMT.format(table=table_name))
+            out.append(f"    Rows: {row_count:,}")
+            out.append(f"    Columns: {col_count}")
+            out.append(f"    Column Names: {', '.join(table_data['columns'][:5])}" + 
+                       (f"... (+{col_count-5} more)" if col_count > 5 else ""))
             
             # Show sample data from each table (first row)
-            try:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 1")
-                sample = cursor.fetchone()
-                if sample:
-                    print(f"    Sample data: {str(sample)[:80]}..." if len(str(sample)) > 80 else f"    Sample data: {sample}")
-            except:
-                pass
+            sample = samples.get(table_name)
+            if sample:
+                out.append(f"    Sample data: {str(sample)[:80]}..." if len(str(sample)) > 80 else f"    Sample data: {sample}")
         
-        print(f"\n{Colors.BOLD}Summary:{Colors.ENDC}")
-        print(f"  Total Rows Across All Tables: {total_rows:,}")
-        print(f"  Average Rows per Table: {total_rows // len(db_info['tables']) if db_info['tables'] else 0:,}")
-        
-        conn.close()
+        out.append(f"\n{Colors.BOLD}Summary:{Colors.ENDC}")
+        out.append(f"  Total Rows Across All Tables: {total_rows:,}")
+        out.append(f"  Average Rows per Table: {total_rows // len(db_info['tables']) if db_info['tables'] else 0:,}")
         
     except Exception as e:
-        print_error(f"Error reading database: {str(e)}")
+        out.append(f"{ERROR_PREFIX}Error reading database: {str(e)}{MESSAGE_END}")
+    
+    write_lines(out)
 
 
 def database_operations_menu():
@@ -636,39 +1103,52 @@ def database_operations_menu():
                     smart_input("\nPress Enter to continue...")
                     continue
                 
-                search_value = smart_input(f"{Colors.OKCYAN}Enter search value: {Colors.ENDC}")
-                use_fuzzy = smart_input(f"{Colors.OKCYAN}Use fuzzy search? (Y/n): {Colors.ENDC}").lower()
-                fuzzy = use_fuzzy in ['y', 'yes', '']
+                search_value = smart_input(f"{Colors.OKCYAN}Enter search value (end with * for a prefix match): {Colors.ENDC}")
+                if search_value.endswith('*') and len(search_value) > 1:
+                    fuzzy = False
+                    print_info("Using prefix search (case-sensitive, uses an index when available)...")
+                else:
+                    use_fuzzy = smart_input(f"{Colors.OKCYAN}Use fuzzy search? (Y/n): {Colors.ENDC}").lower()
+                    fuzzy = use_fuzzy in ['y', 'yes', '']
                 
                 if fuzzy:
                     print_info("Using fuzzy search (case-insensitive, matches all terms)...")
                 
                 columns, rows = search_by_column(selected_db['path'], selected_table, selected_column, search_value, fuzzy)
                 if columns:
-                    display_table_data(columns, rows)
+                    try:
+                        # Rows are fetched lazily while displaying, so read errors surface here
+                        display_table_data(columns, rows)
+                    except Exception as e:
+                        print_error(f"Error searching: {str(e)}")
             
             elif choice == '7':
                 search_value = smart_input(f"{Colors.OKCYAN}Enter search value (searches ALL columns): {Colors.ENDC}")
                 print_info(f"Searching across all columns in {selected_table}...")
                 columns, rows = search_all_columns(selected_db['path'], selected_table, search_value)
                 if columns:
-                    display_table_data(columns, rows)
+                    try:
+                        # Rows are fetched lazily while displaying, so read errors surface here
+                        display_table_data(columns, rows)
+                    except Exception as e:
+                        print_error(f"Error searching: {str(e)}")
             
             elif choice == '8':
                 print(f"\n{Colors.WARNING}Warning: Use SELECT queries only!{Colors.ENDC}")
                 query = smart_input(f"{Colors.OKCYAN}Enter SQL query: {Colors.ENDC}")
                 
                 try:
-                    conn = sqlite3.connect(selected_db['path'])
-                    cursor = conn.cursor()
+                    # The cached read-only connection skips connection setup, enforces
+                    # SELECT-only, and its statement cache serves a re-run of the same query
+                    cursor = _conn(selected_db['path']).cursor()
                     cursor.execute(query)
-                    rows = cursor.fetchall()
                     columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                    conn.close()
                     
                     if columns:
-                        display_table_data(columns, rows)
+                        # Stream the result a page at a time straight from the open cursor
+                        display_table_data(columns, _iter_rows(cursor))
                     else:
+                        cursor.close()
                         print_success("Query executed successfully!")
                 except Exception as e:
                     print_error(f"Query error: {str(e)}")
@@ -680,84 +1160,125 @@ def database_operations_menu():
 # SYSTEM DIAGNOSTICS
 # ============================================================================
 
+# (monotonic time, snapshot) of the last psutil readings shown by get_system_info
+_LAST_SYSTEM_SNAPSHOT = (0.0, None)
+SYSTEM_SNAPSHOT_CACHE_SECONDS = 0.5
+
+if PSUTIL_AVAILABLE:
+    # Prime the non-blocking CPU counter: cpu_percent(interval=None) reports usage since
+    # the previous call, so the first reading taken in get_system_info is meaningful
+    psutil.cpu_percent(interval=None)
+
+
+def _get_system_snapshot() -> Dict:
+    """psutil CPU/memory/disk/network readings, reused for half a second across refreshes."""
+    global _LAST_SYSTEM_SNAPSHOT
+    taken_at, snapshot = _LAST_SYSTEM_SNAPSHOT
+    now = time.monotonic()
+    if snapshot is None or now - taken_at > SYSTEM_SNAPSHOT_CACHE_SECONDS:
+        snapshot = {
+            # Non-blocking: usage since the previous call instead of sampling for a second
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'cpu_count': psutil.cpu_count(),
+            'memory': psutil.virtual_memory(),
+            'disk': psutil.disk_usage('/'),
+            'net_io': psutil.net_io_counters(),
+        }
+        _LAST_SYSTEM_SNAPSHOT = (now, snapshot)
+    return snapshot
+
+
 def get_system_info():
     """Get system information"""
     
     while True:
-        try:
-            import psutil
+        if PSUTIL_AVAILABLE:
+            snapshot = _get_system_snapshot()
             
             print_header("SYSTEM INFORMATION")
             
             # OS Info
             print(f"{Colors.BOLD}Operating System:{Colors.ENDC}")
-            print(f"  Platform: {platform.system()} {platform.release()}")
+            print(f"  Platform: {OS_INFO}")
             print(f"  Architecture: {platform.machine()}")
             print(f"  Hostname: {platform.node()}")
             
             # CPU Info
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
+            cpu_percent = snapshot['cpu_percent']
+            cpu_count = snapshot['cpu_count']
             print(f"\n{Colors.BOLD}CPU:{Colors.ENDC}")
             print(f"  Cores: {cpu_count}")
             print(f"  Usage: {cpu_percent}%")
             
             # Memory Info
-            mem = psutil.virtual_memory()
+            mem = snapshot['memory']
             print(f"\n{Colors.BOLD}Memory:{Colors.ENDC}")
             print(f"  Total: {mem.total / (1024**3):.2f} GB")
             print(f"  Used: {mem.used / (1024**3):.2f} GB ({mem.percent}%)")
             print(f"  Available: {mem.available / (1024**3):.2f} GB")
             
             # Disk Info
-            disk = psutil.disk_usage('/')
+            disk = snapshot['disk']
             print(f"\n{Colors.BOLD}Disk:{Colors.ENDC}")
             print(f"  Total: {disk.total / (1024**3):.2f} GB")
             print(f"  Used: {disk.used / (1024**3):.2f} GB ({disk.percent}%)")
             print(f"  Free: {disk.free / (1024**3):.2f} GB")
             
             # Network Info
-            net_io = psutil.net_io_counters()
+            net_io = snapshot['net_io']
             print(f"\n{Colors.BOLD}Network:{Colors.ENDC}")
             print(f"  Bytes Sent: {net_io.bytes_sent / (1024**2):.2f} MB")
             print(f"  Bytes Received: {net_io.bytes_recv / (1024**2):.2f} MB")
             
-        except ImportError:
+        else:
             print_warning("psutil not installed. Install with: pip install psutil")
             print_info("\nBasic system info:")
-            print(f"  Platform: {platform.system()} {platform.release()}")
-            print(f"  Python: {platform.python_version()}")
+            print(f"  Platform: {OS_INFO}")
+            print(f"  Python: {PYTHON_VERSION}")
         
         choice = smart_input(f"\n{Colors.OKCYAN}Press Enter to refresh, or 0 to go back: {Colors.ENDC}")
         if choice == '0':
             return
 
 
+COMMON_PACKAGES = ['flask', 'django', 'fastapi', 'pandas', 'numpy', 'requests', 'pytest', 'sqlalchemy']
+
+# Installed versions of COMMON_PACKAGES (package -> version), looked up once per session
+_PACKAGE_VERSIONS: Optional[Dict[str, str]] = None
+
+
+def _get_package_versions() -> Dict[str, str]:
+    """Versions of the installed COMMON_PACKAGES, read from package metadata (without
+    importing the packages) on the first call and reused afterwards."""
+    global _PACKAGE_VERSIONS
+    if _PACKAGE_VERSIONS is None:
+        versions = {}
+        for package in COMMON_PACKAGES:
+            try:
+                versions[package] = metadata.version(package)
+            except metadata.PackageNotFoundError:
+                pass  # Don't show not installed to reduce clutter
+        _PACKAGE_VERSIONS = versions
+    return _PACKAGE_VERSIONS
+
+
 def get_python_environment():
     """Get Python environment information"""
     
     while True:
         print_header("PYTHON ENVIRONMENT")
         
-        print(f"{Colors.BOLD}Python Version:{Colors.ENDC} {platform.python_version()}")
+        print(f"{Colors.BOLD}Python Version:{Colors.ENDC} {PYTHON_VERSION}")
         print(f"{Colors.BOLD}Executable:{Colors.ENDC} {sys.executable}")
         print(f"{Colors.BOLD}Virtual Env:{Colors.ENDC} {os.environ.get('VIRTUAL_ENV', 'Not in venv')}")
         
         # Check common packages (optional, won't fail if not present)
         print(f"\n{Colors.BOLD}Common Packages:{Colors.ENDC}")
-        common_packages = ['flask', 'django', 'fastapi', 'pandas', 'numpy', 'requests', 'pytest', 'sqlalchemy']
+        package_versions = _get_package_versions()
+        for package, version in package_versions.items():
+            print_success(f"  {package}: {version}")
         
-        installed_count = 0
-        for package in common_packages:
-            try:
-                mod = __import__(package)
-                version = getattr(mod, '__version__', 'unknown')
-                print_success(f"  {package}: {version}")
-                installed_count += 1
-            except ImportError:
-                pass  # Don't show not installed to reduce clutter
-        
-        if installed_count == 0:
+        if not package_versions:
             print_info("  No common packages detected (or different package set)")
         
         choice = smart_input(f"\n{Colors.OKCYAN}Press Enter to refresh, or 0 to go back: {Colors.ENDC}")
@@ -828,8 +1349,7 @@ def view_environment_variables():
             continue
         
         # Split by os-specific separator
-        separator = ';' if platform.system() == 'Windows' else ':'
-        paths = path_var.split(separator)
+        paths = path_var.split(PATH_SEPARATOR)
         
         for idx, path in enumerate(paths, 1):
             # Check if path exists
@@ -849,7 +1369,7 @@ def add_environment_variable():
     print_info("  - Session-only: Variable exists only for this Python process")
     print_info("  - Permanent: Variable persists across sessions (requires appropriate permissions)")
     
-    current_os = platform.system()
+    current_os = CURRENT_OS
     
     if current_os == 'Windows':
         print_info(f"  - OS Detected: {current_os} - Will use 'setx' for permanent changes")
@@ -940,8 +1460,7 @@ def modify_path_variable():
     """Add or remove entries from PATH variable"""
     print_header("MODIFY PATH VARIABLE")
     
-    current_os = platform.system()
-    separator = ';' if current_os == 'Windows' else ':'
+    current_os = CURRENT_OS
     
     print(highlight_keywords("1. Add new path to PATH"))
     print(highlight_keywords("2. Remove path from PATH"))
@@ -970,10 +1489,12 @@ def modify_path_variable():
             if confirm != 'y':
                 return
         
-        current_path = os.environ.get('PATH', '')
+        # Split PATH once; the set answers "already present" checks
+        path_entries = os.environ.get('PATH', '').split(PATH_SEPARATOR)
+        path_entry_set = set(path_entries)
         
         # Check if already in PATH
-        if new_path in current_path.split(separator):
+        if new_path in path_entry_set:
             print_warning(f"Path already in PATH: {new_path}")
             return
         
@@ -984,8 +1505,8 @@ def modify_path_variable():
         
         if scope_choice == '1':
             # Session-only
-            new_path_value = f"{new_path}{separator}{current_path}"
-            os.environ['PATH'] = new_path_value
+            path_entries.insert(0, new_path)
+            os.environ['PATH'] = PATH_SEPARATOR.join(path_entries)
             print_success(f"Added '{new_path}' to PATH for this session")
         
         elif scope_choice == '2':
@@ -1006,7 +1527,7 @@ def modify_path_variable():
                     
                     if result.returncode == 0:
                         current_permanent_path = result.stdout.strip()
-                        new_permanent_path = f"{new_path}{separator}{current_permanent_path}"
+                        new_permanent_path = f"{new_path}{PATH_SEPARATOR}{current_permanent_path}"
                         
                         # Set using setx
                         set_result = os.system(f'setx PATH "{new_permanent_path}"')
@@ -1015,7 +1536,8 @@ def modify_path_variable():
                             print_success(f"Added '{new_path}' to permanent PATH")
                             print_info("Restart applications for changes to take effect")
                             # Also set for current session
-                            os.environ['PATH'] = f"{new_path}{separator}{os.environ.get('PATH', '')}"
+                            path_entries.insert(0, new_path)
+                            os.environ['PATH'] = PATH_SEPARATOR.join(path_entries)
                         else:
                             print_error("Failed to update PATH. Check permissions.")
                     else:
@@ -1029,7 +1551,7 @@ def modify_path_variable():
                     
                     config_file = bashrc if bashrc.exists() else profile
                     
-                    export_line = f'\nexport PATH="{new_path}{separator}$PATH"\n'
+                    export_line = f'\nexport PATH="{new_path}{PATH_SEPARATOR}$PATH"\n'
                     
                     print_info(f"Will add to: {config_file}")
                     confirm = smart_input(f"{Colors.WARNING}Confirm? (y/n): {Colors.ENDC}").lower()
@@ -1041,7 +1563,8 @@ def modify_path_variable():
                         print_success(f"Added to {config_file}")
                         print_info(f"Run 'source {config_file}' to apply")
                         # Also set for current session
-                        os.environ['PATH'] = f"{new_path}{separator}{os.environ.get('PATH', '')}"
+                        path_entries.insert(0, new_path)
+                        os.environ['PATH'] = PATH_SEPARATOR.join(path_entries)
                     else:
                         print_info("Operation cancelled")
             
@@ -1051,8 +1574,7 @@ def modify_path_variable():
     elif choice == '2':
         # Remove from PATH
         print_info("Current PATH entries:\n")
-        current_path = os.environ.get('PATH', '')
-        paths = current_path.split(separator)
+        paths = os.environ.get('PATH', '').split(PATH_SEPARATOR)
         
         for idx, path in enumerate(paths, 1):
             print(f"{idx}. {path}")
@@ -1070,9 +1592,9 @@ def modify_path_variable():
                 confirm = smart_input(f"{Colors.WARNING}Confirm? (y/n): {Colors.ENDC}").lower()
                 
                 if confirm == 'y':
-                    paths.pop(idx_to_remove - 1)
-                    new_path_value = separator.join(paths)
-                    os.environ['PATH'] = new_path_value
+                    # Drop every occurrence, so a duplicate entry doesn't keep the path active
+                    paths = [path for path in paths if path != path_to_remove]
+                    os.environ['PATH'] = PATH_SEPARATOR.join(paths)
                     
                     print_success(f"Removed from PATH (session only)")
                     print_info("To make permanent, manually edit shell config file")
@@ -1110,21 +1632,56 @@ def environment_variables_menu():
             smart_input("\nPress Enter to continue...")
 
 
+CACHE_FOLDER_NAMES = frozenset({'__pycache__', '.pytest_cache', '.ruff_cache', 'node_modules', '.mypy_cache'})
+
+
+def _dir_size(directory: str) -> int:
+    """Total size in bytes of the regular files under directory (symlinks are not followed)."""
+    total = 0
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def _find_cache_folders(root: Path) -> List[Tuple[Path, int]]:
+    """(path, size in bytes) of every CACHE_FOLDER_NAMES directory under root, in one walk.
+
+    Matched folders are sized but not searched further, since they are deleted whole.
+    """
+    found = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name in CACHE_FOLDER_NAMES:
+                        found.append((Path(entry.path), _dir_size(entry.path)))
+                    else:
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return found
+
+
 def delete_cache_folders():
     """Delete common cache folders recursively"""
     print_header("DELETE CACHE FOLDERS")
     
     root = Path.cwd()
-    cache_patterns = ['__pycache__', '.pytest_cache', '.ruff_cache', 'node_modules', '.mypy_cache']
-    
-    found_caches = []
     
     print_info("Scanning for cache folders...")
-    for pattern in cache_patterns:
-        for cache_dir in root.rglob(pattern):
-            if cache_dir.is_dir():
-                size = sum(f.stat().st_size for f in cache_dir.rglob('*') if f.is_file()) / (1024**2)
-                found_caches.append((cache_dir, size))
+    found_caches = _find_cache_folders(root)
     
     if not found_caches:
         print_success("No cache folders found!")
@@ -1133,8 +1690,9 @@ def delete_cache_folders():
     print(f"\n{Colors.BOLD}Found {len(found_caches)} cache folder(s):{Colors.ENDC}")
     total_size = 0
     for cache_dir, size in found_caches:
-        print(f"  {cache_dir.relative_to(root)} ({size:.2f} MB)")
+        print(f"  {cache_dir.relative_to(root)} ({size / (1024**2):.2f} MB)")
         total_size += size
+    total_size /= 1024**2
     
     print(f"\n{Colors.WARNING}Total size to be freed: {total_size:.2f} MB{Colors.ENDC}")
     confirm = smart_input(f"\n{Colors.FAIL}Delete all cache folders? (y/N): {Colors.ENDC}").lower()
@@ -1143,7 +1701,6 @@ def delete_cache_folders():
         deleted = 0
         for cache_dir, _ in found_caches:
             try:
-                import shutil
                 shutil.rmtree(cache_dir)
                 deleted += 1
                 print_success(f"Deleted: {cache_dir.relative_to(root)}")
@@ -1202,6 +1759,73 @@ def delete_specific_path():
         print_info("Operation cancelled.")
 
 
+# Lines shown from the end of each log, and the size of the blocks it is scanned in
+LOG_TAIL_LINES = 5
+LOG_READ_BUFFER_SIZE = 1 << 20
+
+# Upper-cased markers that classify a log line as an error or a warning
+LOG_ERROR_MARKERS = (b'ERROR', b'FAIL')
+LOG_WARNING_MARKERS = (b'WARN',)
+
+
+def _lines_containing(block: bytes, markers: Tuple[bytes, ...]) -> set:
+    """Start offsets of the lines in block that contain any of markers.
+
+    Each marker is found with bytes.find over the whole block, skipping to the next line
+    after a hit, so lines without a marker cost nothing in Python.
+    """
+    starts = set()
+    for marker in markers:
+        pos = block.find(marker)
+        while pos != -1:
+            starts.add(block.rfind(b'\n', 0, pos) + 1)
+            pos = block.find(b'\n', pos)
+            if pos == -1:
+                break
+            pos = block.find(marker, pos)
+    return starts
+
+
+def _scan_log(log_file: Path) -> Tuple[int, int, int, deque]:
+    """Return (total lines, error lines, warning lines, last lines) of a log file.
+
+    The file is read once in binary blocks of whole lines; each block is upper-cased once
+    and searched for the markers, instead of upper-casing and testing every line.
+    """
+    total_lines = errors = warnings = 0
+    tail = deque(maxlen=LOG_TAIL_LINES)
+    carry = b''
+    with open(log_file, 'rb') as f:
+        while True:
+            data = f.read(LOG_READ_BUFFER_SIZE)
+            if data:
+                # Process whole lines only; a trailing partial line waits for the next block
+                block = carry + data
+                cut = block.rfind(b'\n') + 1
+                block, carry = block[:cut], block[cut:]
+            elif carry:
+                # An unterminated last line still counts as a line
+                block, carry = carry + b'\n', b''
+            else:
+                break
+            if not block:
+                continue
+            
+            total_lines += block.count(b'\n')
+            upper = block.upper()
+            errors += len(_lines_containing(upper, LOG_ERROR_MARKERS))
+            warnings += len(_lines_containing(upper, LOG_WARNING_MARKERS))
+            
+            # Only the block's last few lines can end up in the tail
+            tail_start = len(block) - 1
+            for _ in range(LOG_TAIL_LINES):
+                tail_start = block.rfind(b'\n', 0, tail_start)
+                if tail_start == -1:
+                    break
+            tail.extend(block[tail_start + 1:-1].split(b'\n'))
+    return total_lines, errors, warnings, tail
+
+
 def analyze_logs():
     """Analyze log files"""
     print_header("LOG FILE ANALYSIS")
@@ -1238,34 +1862,47 @@ def analyze_logs():
         print(f"  Size: {log_file.stat().st_size / 1024:.2f} KB")
         
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                total_lines = len(lines)
-                
-                # Count errors and warnings
-                errors = sum(1 for line in lines if 'ERROR' in line.upper() or 'FAIL' in line.upper())
-                warnings = sum(1 for line in lines if 'WARNING' in line.upper() or 'WARN' in line.upper())
-                
-                print(f"  Total Lines: {total_lines}")
-                if errors > 0:
-                    print_error(f"  Errors: {errors}")
-                else:
-                    print_success(f"  Errors: 0")
-                
-                if warnings > 0:
-                    print_warning(f"  Warnings: {warnings}")
-                else:
-                    print_success(f"  Warnings: 0")
-                
-                # Show last 5 lines
-                print(f"\n  {Colors.BOLD}Last 5 lines:{Colors.ENDC}")
-                for line in lines[-5:]:
-                    print(f"    {line.rstrip()}")
+            total_lines, errors, warnings, tail = _scan_log(log_file)
+            
+            print(f"  Total Lines: {total_lines}")
+            if errors > 0:
+                print_error(f"  Errors: {errors}")
+            else:
+                print_success(f"  Errors: 0")
+            
+            if warnings > 0:
+                print_warning(f"  Warnings: {warnings}")
+            else:
+                print_success(f"  Warnings: 0")
+            
+            # Show the last few lines
+            print(f"\n  {Colors.BOLD}Last {LOG_TAIL_LINES} lines:{Colors.ENDC}")
+            for line in tail:
+                print(f"    {line.decode('utf-8', errors='replace').rstrip()}")
         
         except Exception as e:
             print_error(f"  Error reading file: {str(e)}")
 
 
+@lru_cache(maxsize=128)
+def _load_config(path: str, mtime_ns: int):
+    """Parse a configuration file; cached per (path, mtime) so unchanged files aren't
+    parsed again on later visits.
+
+    JSON goes through json and TOML through tomllib (when available); everything else is
+    read as YAML.
+    """
+    text = Path(path).read_text(encoding='utf-8')
+    suffix = Path(path).suffix.lower()
+    if suffix == '.json':
+        return json.loads(text)
+    if suffix == '.toml' and TOMLLIB_AVAILABLE:
+        return tomllib.loads(text)
+    if not YAML_AVAILABLE:
+        raise ImportError("PyYAML not installed. Install with: pip install pyyaml")
+    return yaml.load(text, Loader=YamlSafeLoader)
+
+
 def check_configurations():
     """Check YAML/JSON/INI configurations"""
     print_header("CONFIGURATION AUDIT")
@@ -1301,10 +1938,8 @@ def check_configurations():
         print(f"\n{Colors.BOLD}{config_file.name}:{Colors.ENDC}")
         
         try:
-            import yaml
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                
+            config = _load_config(str(config_file), config_file.stat().st_mtime_ns)
+            
             if config:
                 for key, value in config.items():
                     # Mask sensitive data
@@ -1393,46 +2028,51 @@ def get_database_stats():
 
 def should_exclude_from_zip(path: Path, exclusion_list: List[str]) -> bool:
     """Check if a path should be excluded based on exclusion patterns."""
-    path_parts = path.parts
-    
-    for exclusion in exclusion_list:
-        if exclusion.startswith('*.'):
-            # File extension pattern
-            if path.suffix == exclusion[1:]:
-                return True
-        else:
-            # Directory or file name pattern
-            if exclusion in path_parts or path.name == exclusion:
-                return True
-    return False
+    if exclusion_list is ZIP_EXCLUSIONS:
+        suffixes, names = ZIP_EXCLUDED_SUFFIXES, ZIP_EXCLUDED_NAMES
+    else:
+        suffixes, names = split_exclusions(exclusion_list)
+    # '*.ext' entries match the file suffix; anything else matches a path component
+    # (path.name is always the last component, so it is covered by the parts check)
+    return path.suffix in suffixes or not names.isdisjoint(path.parts)
 
 
 def list_folders_and_files():
     """List all folders and files in the current directory.
     
     Returns:
-        tuple: (folders_list, files_list) where each is a list of Path objects
+        tuple: (folders_list, files_list, file_sizes) where the lists hold Path objects and
+            file_sizes maps each file's Path to its size in bytes
     """
     current_dir = Path.cwd()
     
     folders = []
     files = []
+    file_sizes = {}
     
     try:
-        for item in current_dir.iterdir():
-            if item.is_dir():
-                folders.append(item)
-            elif item.is_file():
-                files.append(item)
+        # One scandir pass: the entry types come with the directory listing and each
+        # file's size is read once here instead of again when the list is displayed
+        with os.scandir(current_dir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    folders.append(Path(entry.path))
+                elif entry.is_file():
+                    path = Path(entry.path)
+                    files.append(path)
+                    file_sizes[path] = entry.stat().st_size
     except Exception as e:
         print_error(f"Error listing directory contents: {str(e)}")
     
-    return sorted(folders, key=lambda x: x.name.lower()), sorted(files, key=lambda x: x.name.lower())
+    return sorted(folders, key=lambda x: x.name.lower()), sorted(files, key=lambda x: x.name.lower()), file_sizes
 
 
-def get_user_selection_for_zip(folders, files):
+def get_user_selection_for_zip(folders, files, file_sizes=None):
     """Display folders and files, get user selection.
     
+    file_sizes (from list_folders_and_files) supplies the displayed file sizes; files
+    missing from it are stat()ed.
+    
     Returns:
         tuple: (selection_type, selected_items) where:
             selection_type: 'all', 'multiple', or 'single'
@@ -1471,7 +2111,9 @@ def get_user_selection_for_zip(folders, files):
         print(f"{Colors.BOLD}Files:{Colors.ENDC}")
         start_idx = len(folders) + 1
         for idx, file in enumerate(files, start=start_idx):
-            size = file.stat().st_size
+            size = (file_sizes or {}).get(file)
+            if size is None:
+                size = file.stat().st_size
             size_str = f"{size / 1024:.1f} KB" if size < 1024**2 else f"{size / (1024**2):.1f} MB"
             print(f"{idx}. [FILE] {file.name} ({size_str})")
     
@@ -1729,14 +2371,14 @@ def create_folder_zip():
     print(f"{Colors.BOLD}{'='*70}{Colors.ENDC}")
     
     # List folders and files
-    folders, files = list_folders_and_files()
+    folders, files, file_sizes = list_folders_and_files()
     
     if not folders and not files:
         print_error("No folders or files found in current directory!")
         return
     
     # Get user selection
-    selection_type, selected_items = get_user_selection_for_zip(folders, files)
+    selection_type, selected_items = get_user_selection_for_zip(folders, files, file_sizes)
     
     if not selected_items:
         print_warning("No items selected. Operation cancelled.")
@@ -2403,17 +3045,19 @@ def main_menu():
                 print_info("Databases: None found")
             
             # Check Python
-            print_success(f"Python: {platform.python_version()}")
+            print_success(f"Python: {PYTHON_VERSION}")
             
             # Check disk space
-            try:
-                import psutil
-                disk = psutil.disk_usage('/')
-                if disk.percent < 90:
-                    print_success(f"Disk Space: {disk.free / (1024**3):.2f} GB free ({100-disk.percent:.1f}%)")
-                else:
-                    print_warning(f"Disk Space: LOW ({100-disk.percent:.1f}% free)")
-            except:
+            if PSUTIL_AVAILABLE:
+                try:
+                    disk = psutil.disk_usage('/')
+                    if disk.percent < 90:
+                        print_success(f"Disk Space: {disk.free / (1024**3):.2f} GB free ({100-disk.percent:.1f}%)")
+                    else:
+                        print_warning(f"Disk Space: LOW ({100-disk.percent:.1f}% free)")
+                except OSError:
+                    print_info("Disk Space: Cannot check")
+            else:
                 print_info("Disk Space: Cannot check (install psutil)")
             
             # Check for config files
@@ -1,5 +1,52 @@
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 
+# Optional C-accelerated JSON encoder (falls back to Flask's stdlib provider)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 db = SQLAlchemy()
 login_manager = LoginManager()
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson.
+
+    Output matches the default provider: sorted keys, and dates/Decimal/UUID
+    converted through Flask's default hook. The options response() always
+    passes (compact separators, or indent=2 in debug) map onto orjson's own
+    output; anything orjson can't handle, or any other json.dumps option,
+    falls back to the stdlib encoder.
+    """
+
+    _options = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if ORJSON_AVAILABLE else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        options = self._options
+        orjson_kwargs = dict(kwargs)
+        # orjson output is already compact and key-sorted
+        if orjson_kwargs.get('separators') == (',', ':'):
+            del orjson_kwargs['separators']
+        if orjson_kwargs.get('sort_keys'):
+            del orjson_kwargs['sort_keys']
+        if 'indent' in orjson_kwargs and orjson_kwargs['indent'] in (None, 2):
+            if orjson_kwargs.pop('indent') == 2:
+                options |= orjson.OPT_INDENT_2
+        if orjson_kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=options).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -7,7 +7,7 @@ from datetime import timedelta
 import config
 
 # custom
-from extensions import db, login_manager
+from extensions import db, login_manager, ORJSON_AVAILABLE, ORJSONProvider
 
 #values
 basedir = os.path.abspath(os.path.dirname(__file__))# this files location
@@ -19,14 +19,21 @@ DB_PASSWORD = config.DB_PASSWORD
 DB_PORT = config.DB_PORT
 DB_HOST = config.DB_HOST
 
+# Request worker threads for the Waitress server (wsgi_run.py); the DB pool is sized to match
+WSGI_THREADS = int(os.getenv("WSGI_THREADS", "12"))
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)  # Faster jsonify/get_json when orjson is installed
 app.secret_key = config.SECRET_KEY or os.urandom(24)  # Use fixed secret key for persistent sessions
 app.permanent_session_lifetime = timedelta(days=30)  # Session lasts 30 days
+app.config['SESSION_REFRESH_EACH_REQUEST'] = False  # Only re-send the session cookie when its contents change
 app.config['SQLALCHEMY_DATABASE_URI'] = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
 # Database connection pool settings for better reliability
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     'pool_pre_ping': True,  # Verify connections before use
+    'pool_size': WSGI_THREADS,  # One connection per worker thread so I/O-bound requests don't queue for the pool
     'pool_recycle': 300,    # Recycle connections every 5 minutes
     'pool_timeout': 20,     # Wait 20 seconds for connection
     'max_overflow': 0,      # Don't create extra connections beyond pool size
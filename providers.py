@@ -1,6 +1,11 @@
-import os, requests
+import os, json, requests
 import config
 
+# Shared session so chat calls to the same provider reuse pooled keep-alive
+# connections instead of paying a TCP/TLS handshake on every message
+http_session = requests.Session()
+http_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
 
 class LLMClient:
     """LLM client with optional summarization configuration."""
@@ -47,9 +52,8 @@ class LLMClient:
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
-            # "stream": True,  # you can enable streaming later
         }
-        r = requests.post(self.url, json=payload, headers=self.headers, timeout=timeout)
+        r = http_session.post(self.url, json=payload, headers=self.headers, timeout=timeout)
         r.raise_for_status()
         j = r.json()
         # OpenAI-compatible shape
@@ -58,3 +62,32 @@ class LLMClient:
         except Exception:
             # Fallback best-effort
             return str(j)
+
+    def stream_chat(self, messages, temperature=0.2, max_tokens=512, timeout=60, model=None):
+        """Yield reply text chunks as the provider streams them (OpenAI-compatible SSE)."""
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        with http_session.post(self.url, json=payload, headers=self.headers, timeout=timeout, stream=True) as r:
+            r.raise_for_status()
+            # SSE is UTF-8 by definition, but a text/event-stream response without a
+            # charset makes requests fall back to ISO-8859-1 and garble non-ASCII tokens
+            r.encoding = "utf-8"
+            for line in r.iter_lines(decode_unicode=True):
+                # SSE frames look like "data: {...}"; blank lines and ": keep-alive" comments are skipped
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    delta = json.loads(data)["choices"][0].get("delta") or {}
+                except (ValueError, KeyError, IndexError):
+                    continue
+                content = delta.get("content")
+                if content:
+                    yield content
@@ -0,0 +1,50 @@
+"""
+Tests for the calculator's safe expression evaluator.
+
+Tests:
+1. Valid arithmetic, functions and the '|' argument delimiter
+2. Oversized powers/products are rejected before they are computed
+3. Sequence repetition (tuples, strings) can't be used to allocate memory
+"""
+
+import time
+
+from calculator import Calculator
+
+
+def evaluate(expression):
+    return Calculator(expression).evaluate()
+
+
+def test_valid_expressions():
+    """Ordinary expressions still evaluate to the expected results."""
+    assert evaluate('1+2*3') == '7'
+    assert evaluate('2^10') == '1024'
+    assert evaluate('2^-3') == '0.125'
+    assert evaluate('(-1)^9999') == '-1'
+    assert evaluate('10/4') == '2.5'
+    assert evaluate('sqrt(16)+tax(100|5)') == '9'
+    assert evaluate('markup(100|10)') == '110'
+
+
+def test_oversized_results_rejected():
+    """Huge exponents and nested powers return Error quickly instead of tying up a worker."""
+    for expression in ('2^10001', '(9^10000)^1000', '9^9^9', '(2^50000)*(2^60000)'):
+        start = time.perf_counter()
+        assert evaluate(expression) == 'Error'
+        assert time.perf_counter() - start < 1
+
+
+def test_sequence_repetition_rejected():
+    """Tuples and strings can't be multiplied into enormous sequences."""
+    for expression in ('(1|)*10^9', '(1|)*10^5', 'profit(0|1)*10^9', '(1|2)+(3|4)'):
+        start = time.perf_counter()
+        assert evaluate(expression) == 'Error'
+        assert time.perf_counter() - start < 1
+
+
+if __name__ == '__main__':
+    test_valid_expressions()
+    test_oversized_results_rejected()
+    test_sequence_repetition_rejected()
+    print("✓ All calculator tests passed")
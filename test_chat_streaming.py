@@ -0,0 +1,195 @@
+"""
+Test script for streamed MioChat replies (POST /chat with "stream": true).
+
+The provider is replaced by a canned OpenAI-style SSE body served through
+providers.http_session.post, so the real stream parsing runs without any
+network access. Runs against the app's configured database with a throwaway
+user that is removed afterwards.
+
+Tests:
+1. Client receives one delta frame per token plus a final done frame
+2. The assembled reply is saved as the assistant message
+3. A stream cut off by the provider still saves what arrived
+4. A client disconnecting mid-stream still saves what arrived
+"""
+
+import json
+import secrets
+from contextlib import contextmanager
+from unittest import mock
+
+import requests
+
+from flask_app import app
+from extensions import db
+from providers import http_session
+from blueprints.p2.models import User
+from blueprints.p3.models import ChatSession, ChatMessage
+
+CHAT_URL = '/chat'
+TOKENS = ['Hello', ', wörld', ' 📌']
+TOKEN_FRAMES = [
+    # Raw UTF-8, as providers send it, so multibyte tokens exercise decoding
+    f'data: {json.dumps({"choices": [{"delta": {"content": token}}]}, ensure_ascii=False)}\n\n'
+    for token in TOKENS
+]
+SSE_BODY = (
+    'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n'
+    ': keep-alive\n\n'
+    + ''.join(TOKEN_FRAMES)
+    + 'data: [DONE]\n\n'
+).encode('utf-8')
+
+
+class CannedRaw:
+    """Raw body that returns fixed chunks, then optionally fails like a dropped connection."""
+
+    def __init__(self, chunks, error=None):
+        self._chunks = list(chunks)
+        self._error = error
+
+    def read(self, amt=None, **kwargs):
+        if self._chunks:
+            return self._chunks.pop(0)
+        if self._error:
+            raise self._error
+        return b''
+
+    def close(self):
+        pass
+
+
+def canned_post(chunks, error=None):
+    """Return a stand-in for http_session.post that serves chunks as an SSE response."""
+    def post(url, **kwargs):
+        assert kwargs.get('stream') is True
+        response = requests.Response()
+        response.status_code = 200
+        # No charset, like most providers send for text/event-stream
+        response.headers['Content-Type'] = 'text/event-stream'
+        response.raw = CannedRaw(chunks, error)
+        return response
+    return post
+
+
+def split_bytes(data, size=7):
+    """Split data into small chunks so multibyte characters straddle chunk boundaries."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def parse_frames(body):
+    """Decode "data: {...}" SSE frames from a response body."""
+    return [
+        json.loads(frame[len('data: '):])
+        for frame in body.split('\n\n')
+        if frame.startswith('data: ')
+    ]
+
+
+@contextmanager
+def chat_client():
+    """Yield (client, chat session id) for a logged-in throwaway user, then delete it."""
+    user = User(username=f"stream_test_{secrets.token_hex(6)}", user_type='user')
+    db.session.add(user)
+    db.session.commit()
+    chat_session = ChatSession(user_id=user.id, title='Streaming test')
+    db.session.add(chat_session)
+    db.session.commit()
+    try:
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(user.id)
+            sess['_fresh'] = True
+            sess['current_chat_session_id'] = chat_session.id
+        yield client, chat_session.id
+    finally:
+        db.session.rollback()
+        ChatMessage.query.filter_by(session_id=chat_session.id).delete()
+        ChatSession.query.filter_by(id=chat_session.id).delete()
+        User.query.filter_by(id=user.id).delete()
+        db.session.commit()
+
+
+def saved_replies(session_id):
+    """Return the assistant messages saved for a chat session."""
+    db.session.expire_all()
+    return ChatMessage.query.filter_by(session_id=session_id, role='assistant').all()
+
+
+def post_stream(client, **kwargs):
+    return client.post(CHAT_URL, json={'message': 'Say hello', 'stream': True}, **kwargs)
+
+
+def test_stream_frames_and_saved_reply():
+    """Every token reaches the client as a frame and the full reply is saved."""
+    with app.app_context(), chat_client() as (client, session_id):
+        with mock.patch.object(http_session, 'post', side_effect=canned_post(split_bytes(SSE_BODY))):
+            response = post_stream(client)
+            body = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        frames = parse_frames(body)
+        assert [frame['delta'] for frame in frames[:-1]] == TOKENS
+        done = frames[-1]
+        assert done['done'] is True
+
+        replies = saved_replies(session_id)
+        assert len(replies) == 1
+        assert replies[0].content == ''.join(TOKENS)
+        assert done['assistant_message_id'] == replies[0].id
+        print("✓ Frames delivered and full reply saved")
+
+
+def test_provider_cut_off_saves_partial_reply():
+    """A dropped provider connection keeps the tokens that already arrived."""
+    # Drop the connection right after the second token
+    partial = SSE_BODY[:SSE_BODY.index(TOKEN_FRAMES[2].encode('utf-8'))]
+    dropped = requests.exceptions.ChunkedEncodingError('Connection broken')
+
+    with app.app_context(), chat_client() as (client, session_id):
+        with mock.patch.object(http_session, 'post', side_effect=canned_post(split_bytes(partial), dropped)):
+            response = post_stream(client)
+            body = response.get_data(as_text=True)
+
+        frames = parse_frames(body)
+        deltas = [frame['delta'] for frame in frames if 'delta' in frame]
+        assert deltas[:2] == TOKENS[:2]
+        assert len(deltas) == 3, "the connection error is reported as a last delta"
+        assert frames[-1]['done'] is True
+
+        replies = saved_replies(session_id)
+        assert len(replies) == 1
+        assert replies[0].content.startswith(''.join(TOKENS[:2]))
+        assert frames[-1]['assistant_message_id'] == replies[0].id
+        print("✓ Provider cut-off saves the partial reply")
+
+
+def test_client_disconnect_saves_partial_reply():
+    """Closing the response mid-stream still saves the tokens sent so far."""
+    with app.app_context(), chat_client() as (client, session_id):
+        with mock.patch.object(http_session, 'post', side_effect=canned_post(split_bytes(SSE_BODY))):
+            response = post_stream(client, buffered=False)
+            first_frame = next(iter(response.response))
+            response.close()
+
+        frame = parse_frames(first_frame.decode('utf-8') if isinstance(first_frame, bytes) else first_frame)
+        assert frame == [{'delta': TOKENS[0]}]
+
+        replies = saved_replies(session_id)
+        assert len(replies) == 1
+        assert replies[0].content == TOKENS[0]
+        print("✓ Client disconnect saves the partial reply")
+
+
+if __name__ == '__main__':
+    print("\n" + "=" * 60)
+    print("MioChat Streaming - Tests")
+    print("=" * 60 + "\n")
+
+    test_stream_frames_and_saved_reply()
+    test_provider_cut_off_saves_partial_reply()
+    test_client_disconnect_saves_partial_reply()
+
+    print("\nAll tests completed!")
+    print("=" * 60)
@@ -0,0 +1,133 @@
+"""
+Test script for the Chrome extension /folders conditional response.
+
+Runs against the app's configured database with a throwaway user that is
+removed afterwards.
+
+Tests:
+1. Matching If-None-Match returns 304 with an empty body
+2. Renaming a folder changes the ETag
+3. Missing or mismatched If-None-Match returns 200 with the folder tree
+"""
+
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from flask_app import app
+from extensions import db
+from blueprints.p2.models import User, Folder, File
+from blueprints.p2.extension_api import clear_api_token_cache
+
+FOLDERS_URL = '/api/extension/folders'
+
+
+@contextmanager
+def throwaway_user():
+    """Yield (user, auth headers) for a temporary extension user, then delete it."""
+    token = secrets.token_urlsafe(32)
+    user = User(
+        username=f"etag_test_{secrets.token_hex(6)}",
+        user_type='user',
+        api_token=token,
+        api_token_expires=datetime.utcnow() + timedelta(days=1)
+    )
+    db.session.add(user)
+    db.session.commit()
+    try:
+        yield user, {'Authorization': f'Bearer {token}'}
+    finally:
+        db.session.rollback()
+        clear_api_token_cache(token)
+        File.query.filter_by(owner_id=user.id).delete()
+        Folder.query.filter_by(user_id=user.id, is_root=False).delete()
+        Folder.query.filter_by(user_id=user.id).delete()
+        User.query.filter_by(id=user.id).delete()
+        db.session.commit()
+
+
+def find_folder(tree, name):
+    """Return the first node called name in a /folders tree, or None."""
+    if tree['name'] == name:
+        return tree
+    for child in tree['children']:
+        found = find_folder(child, name)
+        if found:
+            return found
+    return None
+
+
+def test_matching_etag_returns_304():
+    """A repeat request with the current ETag gets an empty 304."""
+    with app.app_context(), throwaway_user() as (user, headers):
+        client = app.test_client()
+
+        first = client.get(FOLDERS_URL, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers.get('ETag')
+        assert etag, "200 response should carry an ETag"
+
+        second = client.get(FOLDERS_URL, headers={**headers, 'If-None-Match': etag})
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers.get('ETag') == etag
+        assert second.headers.get('Cache-Control') == 'private, no-cache'
+        print("✓ Matching If-None-Match returns empty 304")
+
+
+def test_rename_changes_etag():
+    """Renaming a folder invalidates the previous ETag."""
+    with app.app_context(), throwaway_user() as (user, headers):
+        client = app.test_client()
+
+        # Creates the root folder on first use
+        client.get(FOLDERS_URL, headers=headers)
+        root = Folder.query.filter_by(user_id=user.id, is_root=True).one()
+        folder = Folder(name='ETag Before', user_id=user.id, parent_id=root.id)
+        db.session.add(folder)
+        db.session.commit()
+
+        before = client.get(FOLDERS_URL, headers=headers)
+        old_etag = before.headers['ETag']
+        assert find_folder(before.get_json()['folders'][0], 'ETag Before')
+
+        folder.name = 'ETag After'
+        db.session.commit()
+
+        after = client.get(FOLDERS_URL, headers={**headers, 'If-None-Match': old_etag})
+        assert after.status_code == 200, "stale ETag must not get a 304 after a rename"
+        assert after.headers['ETag'] != old_etag
+        tree = after.get_json()['folders'][0]
+        assert find_folder(tree, 'ETag After')
+        assert not find_folder(tree, 'ETag Before')
+        print("✓ Rename changes the ETag")
+
+
+def test_missing_or_mismatched_etag_returns_tree():
+    """Without a matching If-None-Match the full tree is returned."""
+    with app.app_context(), throwaway_user() as (user, headers):
+        client = app.test_client()
+
+        for extra in ({}, {'If-None-Match': 'W/"not-the-current-etag"'}):
+            response = client.get(FOLDERS_URL, headers={**headers, **extra})
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['success'] is True
+            root = data['folders'][0]
+            assert root['is_root'] and root['id'] == data['root_folder_id']
+            assert data['default_folder_id'] == data['root_folder_id']
+            assert response.headers.get('ETag')
+        print("✓ Missing/mismatched If-None-Match returns 200 with the tree")
+
+
+if __name__ == '__main__':
+    print("\n" + "=" * 60)
+    print("Chrome Extension /folders ETag - Tests")
+    print("=" * 60 + "\n")
+
+    test_matching_etag_returns_304()
+    test_rename_changes_etag()
+    test_missing_or_mismatched_etag_returns_tree()
+
+    print("\nAll tests completed!")
+    print("=" * 60)
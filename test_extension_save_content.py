@@ -0,0 +1,163 @@
+"""
+Test script for the Chrome extension save-clip path (/save-content).
+
+Runs against the app's configured database with throwaway users that are
+removed afterwards.
+
+Tests:
+1. Byte delta of appending to empty vs non-empty content (incl. multibyte text)
+2. Clips from the same page are appended in SQL and the quota tracks stored bytes
+3. Over-quota clips are rejected with nothing committed
+"""
+
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from flask_app import app
+from extensions import db
+from blueprints.p2.models import User, Folder, File
+from blueprints.p2.extension_api import (
+    append_to_html_content,
+    appended_content_bytes,
+    clear_api_token_cache,
+)
+
+SAVE_URL = '/api/extension/save-content'
+PAGE_URL = 'https://example.com/article'
+GUEST_LIMIT = 50 * 1024 * 1024
+
+
+@contextmanager
+def throwaway_user(user_type='user', total_data_size=0):
+    """Yield (user, auth headers) for a temporary extension user, then delete it."""
+    token = secrets.token_urlsafe(32)
+    user = User(
+        username=f"clip_test_{secrets.token_hex(6)}",
+        user_type=user_type,
+        total_data_size=total_data_size,
+        api_token=token,
+        api_token_expires=datetime.utcnow() + timedelta(days=1)
+    )
+    db.session.add(user)
+    db.session.commit()
+    try:
+        yield user, {'Authorization': f'Bearer {token}'}
+    finally:
+        db.session.rollback()
+        clear_api_token_cache(token)
+        File.query.filter_by(owner_id=user.id).delete()
+        Folder.query.filter_by(user_id=user.id, is_root=False).delete()
+        Folder.query.filter_by(user_id=user.id).delete()
+        User.query.filter_by(id=user.id).delete()
+        db.session.commit()
+
+
+def save_text_clip(client, headers, text, url=PAGE_URL):
+    """POST a text clip for url and return the response."""
+    return client.post(SAVE_URL, headers=headers, json={
+        'type': 'text',
+        'content': text,
+        'url': url,
+        'page_title': 'Example Article'
+    })
+
+
+def stored_html(file_id):
+    """Read a file's content_html straight from the database."""
+    db.session.expire_all()
+    return db.session.query(File.content_html).filter(File.id == file_id).scalar()
+
+
+def test_appended_content_bytes():
+    """The delta matches the UTF-8 size change of append_to_html_content()."""
+    cases = [
+        ('', '<p>First clip</p>'),
+        ('', '<p>Grüße, 日本語 📌</p>'),
+        ('<p>First clip</p>', '<p>Second clip</p>'),
+        ('<p>Grüße</p>', '<p>日本語 📌 clip</p>'),
+        ('<p>📌 Saved</p>', ''),
+    ]
+    for existing, new in cases:
+        existing_size = len(existing.encode('utf-8'))
+        expected = len(append_to_html_content(existing, new).encode('utf-8')) - existing_size
+        assert appended_content_bytes(existing_size, new) == expected, (existing, new)
+
+    # A NULL column (LENGTH() of NULL) counts as empty content
+    assert appended_content_bytes(None, '<p>é</p>') == len('<p>é</p>'.encode('utf-8'))
+    # Multibyte text is counted in bytes, not characters
+    assert appended_content_bytes(0, '日本語') == 9
+    print("✓ Append byte deltas match the appended content")
+
+
+def test_same_page_clips_append_in_sql():
+    """Two clips from one page share a file and the quota matches its bytes."""
+    with app.app_context(), throwaway_user() as (user, headers):
+        client = app.test_client()
+
+        first = save_text_clip(client, headers, 'First clip: Grüße')
+        assert first.status_code == 200, first.get_json()
+        file_info = first.get_json()['file']
+        assert file_info['is_new'] is True
+        first_html = stored_html(file_info['id'])
+        db.session.refresh(user)
+        assert user.total_data_size == len(first_html.encode('utf-8'))
+
+        second = save_text_clip(client, headers, 'Second clip: 日本語 📌')
+        assert second.status_code == 200, second.get_json()
+        second_info = second.get_json()['file']
+        assert second_info['id'] == file_info['id'], "same page should append to the same file"
+        assert second_info['is_new'] is False
+        assert second_info['clip_count'] == 1
+
+        html = stored_html(file_info['id'])
+        assert html.startswith(first_html)
+        new_clip = html[len(first_html):].split('\n', 2)[2]
+        assert html == append_to_html_content(first_html, new_clip)
+        assert '日本語 📌' in new_clip
+        db.session.refresh(user)
+        assert user.total_data_size == len(html.encode('utf-8'))
+        assert File.query.filter_by(owner_id=user.id).count() == 1
+        print("✓ Same-page clips are appended and counted in bytes")
+
+
+def test_over_quota_clip_not_committed():
+    """A guest clip past the quota is rejected and leaves no changes behind."""
+    with app.app_context(), throwaway_user(user_type='guest') as (user, headers):
+        client = app.test_client()
+
+        first = save_text_clip(client, headers, 'Existing clip')
+        assert first.status_code == 200, first.get_json()
+        file_id = first.get_json()['file']['id']
+        html_before = stored_html(file_id)
+
+        # Leave room for fewer bytes than the next clip needs
+        db.session.refresh(user)
+        user.total_data_size = GUEST_LIMIT - 10
+        db.session.commit()
+
+        for url in (PAGE_URL, 'https://example.com/other-page'):
+            response = save_text_clip(client, headers, 'Clip over quota ' * 10, url=url)
+            assert response.status_code == 403, response.get_json()
+            assert response.get_json()['error'] == 'Storage quota exceeded'
+
+        assert stored_html(file_id) == html_before
+        target = db.session.get(File, file_id)
+        assert target.metadata_json.get('clip_count', 0) == 0
+        assert File.query.filter_by(owner_id=user.id).count() == 1
+        db.session.refresh(user)
+        assert user.total_data_size == GUEST_LIMIT - 10
+        print("✓ Over-quota clips are rolled back")
+
+
+if __name__ == '__main__':
+    print("\n" + "=" * 60)
+    print("Chrome Extension Save Clip - Tests")
+    print("=" * 60 + "\n")
+
+    test_appended_content_bytes()
+    test_same_page_clips_append_in_sql()
+    test_over_quota_clip_not_committed()
+
+    print("\nAll tests completed!")
+    print("=" * 60)
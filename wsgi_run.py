@@ -1,7 +1,8 @@
-from flask_app import app
+from flask_app import app, WSGI_THREADS
 from waitress import serve
 
 if __name__ == "__main__":
     print("Starting WSGI server with Waitress...")
-    print("serving on http://localhost:5555")
-    serve(app, host='0.0.0.0', port=5555)
\ No newline at end of file
+    print(f"serving on http://localhost:5555 ({WSGI_THREADS} threads)")
+    # Extension saves block on DB and image I/O; enough threads keep bursts from queueing
+    serve(app, host='0.0.0.0', port=5555, threads=WSGI_THREADS, connection_limit=500)
\ No newline at end of file